@@ -18,14 +18,32 @@ Requirements:
     - pydantic
 """
 
+import asyncio
+import atexit
+import collections
+import concurrent.futures
+import contextlib
+import functools
+import hashlib
+import importlib
+import itertools
 import json
 import os
+import queue
 import re
+import shlex
 import shutil
 import subprocess
+import sys
+import tempfile
+import threading
+import time
+import uuid
+import weakref
+from collections.abc import AsyncIterator, Awaitable, Callable, Sequence
 from enum import Enum
 from pathlib import Path
-from typing import Any
+from typing import IO, Any, Generic, Literal, NamedTuple, TypeVar
 
 from mcp.server.fastmcp import FastMCP
 from mcp.types import ToolAnnotations
@@ -36,73 +54,1170 @@ from pydantic import BaseModel, ConfigDict, Field, ValidationInfo, field_validat
 # =============================================================================
 
 SERVER_NAME = "lldb_mcp"
-LLDB_EXECUTABLE = shutil.which("lldb") or "lldb"
+
+# Where the resolved lldb path is remembered between server starts, and how long
+# a cached entry is used before $PATH is searched again
+_LLDB_PATH_CACHE = Path("~/.cache/claude_lldb_mcp/lldb_path").expanduser()
+_LLDB_PATH_TTL = 24 * 60 * 60
+
+
+def _resolve_lldb() -> str:
+    """Locate the lldb executable, reusing the last result for the same $PATH."""
+    path_hash = hashlib.blake2b(os.environ.get("PATH", "").encode()).hexdigest()
+    try:
+        cached_hash, cached_path = _LLDB_PATH_CACHE.read_text().splitlines()
+        age = time.time() - _LLDB_PATH_CACHE.stat().st_mtime
+        # An lldb that was uninstalled or moved falls through to a fresh search
+        if cached_hash == path_hash and age < _LLDB_PATH_TTL and os.access(cached_path, os.X_OK):
+            return cached_path
+    except (OSError, ValueError):
+        pass
+
+    found = shutil.which("lldb")
+    if found is None:
+        return "lldb"
+    try:
+        _LLDB_PATH_CACHE.parent.mkdir(parents=True, exist_ok=True)
+        _LLDB_PATH_CACHE.write_text(f"{path_hash}\n{found}\n")
+    except OSError:
+        pass
+    return found
+
+
+# An explicit LLDB_MCP_LLDB skips PATH discovery (and its cache) entirely
+LLDB_EXECUTABLE = os.environ.get("LLDB_MCP_LLDB") or _resolve_lldb()
+
+# Execution backend: "batch" spawns a fresh `lldb --batch` for every tool call,
+# "persistent" keeps interactive LLDB processes alive and reuses them, and
+# "sbapi" drives LLDB in-process through its Python bindings.
+LLDB_BACKEND = os.environ.get("LLDB_MCP_BACKEND", "batch").strip().lower()
+MAX_WORKERS = int(os.environ.get("LLDB_MCP_MAX_WORKERS", "8"))
+_MAX_SESSIONS = int(os.environ.get("LLDB_MCP_MAX_SESSIONS", "64"))
+# Cap on concurrently running batch-mode LLDB processes
+MAX_LLDB_PROCS = int(os.environ.get("LLDB_MCP_MAX_PROCS", "0")) or os.cpu_count() or 4
+# How long (seconds) the SB API backend keeps a program stopped at a breakpoint
+_PAUSED_TTL = float(os.environ.get("LLDB_MCP_PAUSED_TTL", "300"))
+_MAX_PAUSED = 8
+
+# Settings applied to every session unless a caller opts out with fast_mode=False:
+# don't flush the memory cache after LLDB's own expression evaluation, map only
+# the module sections LLDB needs, and don't auto-load scripts from symbol files.
+_PRELUDE_SETTINGS = {
+    "target.process.track-memory-cache-changes": "false",
+    "target.memory-module-load-level": "minimal",
+    "target.load-script-from-symbol-file": "false",
+}
+_PRELUDE_COMMANDS = [f"settings set {name} {value}" for name, value in _PRELUDE_SETTINGS.items()]
+_PRELUDE_ECHO = "".join(f"(lldb) {command}\n" for command in _PRELUDE_COMMANDS).encode()
+
+# After a crash, --batch drops back to the interactive prompt instead of exiting;
+# -k runs quit in that case so a batch run can never wait on input
+_BATCH_ON_CRASH = ("-k", "quit")
+
+# Chunk size for reading LLDB's stdout as it is produced
+_READ_CHUNK = 64 * 1024
+
+
+_T = TypeVar("_T")
+
+# (st_dev, st_ino, st_mtime_ns, st_size) of a file, identifying one build of it
+_FileVersion = tuple[int, int, int, int]
+
+
+class Frame(NamedTuple):
+    """One stack frame from a backtrace."""
+
+    frame_number: int
+    address: str
+    module: str | None
+    function: str | None
+    offset: int | None
+    file: str | None
+    line: int | None
 
 
 # Global state for managing debug sessions
 class DebugSession:
     """Represents an active LLDB debug session."""
 
+    __slots__ = ("session_id", "target_path", "process", "breakpoints", "is_running", "last_output")
+
     def __init__(self, session_id: str, target_path: str | None = None):
         self.session_id = session_id
         self.target_path = target_path
-        self.process = None
+        self.process: LldbWorker | None = None
         self.breakpoints: dict[int, dict[str, Any]] = {}
         self.is_running = False
         self.last_output = ""
 
+    def reset(self, session_id: str, target_path: str | None = None) -> None:
+        """Reinitialize a pooled session for reuse, keeping its breakpoint dict."""
+        self.session_id = session_id
+        self.target_path = target_path
+        self.process = None
+        self.breakpoints.clear()
+        self.is_running = False
+        self.last_output = ""
+
+    def close(self) -> None:
+        """Shut down the session's LLDB process, if it has one."""
+        process, self.process = self.process, None
+        if process is not None:
+            process.close()
+        self.is_running = False
+
 
-# Session storage
-_sessions: dict[str, DebugSession] = {}
-_session_counter = 0
+# Sessions, least recently used first, plus released sessions kept around for reuse
+_sessions: collections.OrderedDict[str, DebugSession] = collections.OrderedDict()
+_session_pool: collections.deque[DebugSession] = collections.deque(maxlen=32)
+_SID_ITER = itertools.count(1)
 
 
 def _get_next_session_id() -> str:
     """Generate a unique session ID."""
-    global _session_counter
-    _session_counter += 1
-    return f"lldb_{_session_counter}"
+    return f"lldb_{next(_SID_ITER)}"
 
 
-def _run_lldb_command(
-    command: str,
-    target: str | None = None,
-    args: list[str] | None = None,
+def _acquire_session(target_path: str | None = None, session_id: str | None = None) -> DebugSession:
+    """Register a new session, reusing a pooled DebugSession when one is available.
+
+    The session is registered under session_id if given, else a generated ID.
+    """
+    session_id = session_id or _get_next_session_id()
+    if _session_pool:
+        session = _session_pool.pop()
+        session.reset(session_id, target_path)
+    else:
+        session = DebugSession(session_id, target_path)
+    _sessions[session_id] = session
+    while len(_sessions) > _MAX_SESSIONS:
+        _, evicted = _sessions.popitem(last=False)
+        evicted.close()
+        _session_pool.append(evicted)
+    return session
+
+
+def _touch(session_id: str) -> DebugSession | None:
+    """Look up a session and mark it as most recently used."""
+    session = _sessions.get(session_id)
+    if session is not None:
+        _sessions.move_to_end(session_id)
+    return session
+
+
+def release_session(session_id: str) -> bool:
+    """Unregister a session, shut it down and return it to the pool.
+
+    Returns whether the session existed.
+    """
+    session = _sessions.pop(session_id, None)
+    if session is None:
+        return False
+    session.close()
+    _session_pool.append(session)
+    return True
+
+
+# =============================================================================
+# Persistent LLDB Workers
+# =============================================================================
+
+
+class _WorkerStartError(Exception):
+    """Raised when a new LLDB worker dies or times out during its setup commands."""
+
+    def __init__(self, result: dict[str, Any]):
+        super().__init__(result.get("error"))
+        self.result = result
+
+
+class LldbWorker:
+    """A long-lived interactive LLDB process driven over stdin/stdout.
+
+    Each batch of commands is followed by a ``script print`` of a unique sentinel,
+    and stdout is read until that sentinel line appears. Between batches the
+    worker is reset so every tool call still starts from a clean target; a
+    session's worker keeps its target and breakpoints and only drops the
+    launched process.
+    """
+
+    def __init__(self, target: str | None = None, working_dir: str | None = None):
+        self.target = target
+        self.working_dir = working_dir
+        self.lock = threading.Lock()
+        self.proc = subprocess.Popen(
+            [LLDB_EXECUTABLE],
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
+            cwd=working_dir or None,
+        )
+        self._lines: queue.Queue[bytes | None] = queue.Queue()
+        self._stderr: collections.deque[bytes] = collections.deque(maxlen=200)
+        self._start_pump(self.proc.stdout, self._lines.put)
+        self._start_pump(self.proc.stderr, self._stderr.append)
+
+        # Synchronous mode makes `run` block until the process stops, so the
+        # sentinel is never printed ahead of the stop report.
+        init = ["script lldb.debugger.SetAsync(False)", *_PRELUDE_COMMANDS]
+        if target:
+            init.append(f"target create {shlex.quote(target)}")
+        result = self._execute(init, timeout=60)
+        if not result["success"]:
+            # Never hand out (or pool) a worker whose stdin is already closed
+            self.close()
+            raise _WorkerStartError(result)
+
+    @staticmethod
+    def _start_pump(stream: IO[bytes] | None, sink: Any) -> None:
+        def pump() -> None:
+            assert stream is not None
+            for line in iter(stream.readline, b""):
+                sink(line)
+            sink(None)
+
+        threading.Thread(target=pump, daemon=True).start()
+
+    @property
+    def alive(self) -> bool:
+        return self.proc.poll() is None
+
+    def _reset_commands(self) -> list[str]:
+        commands = [
+            "target delete --all",
+            "settings clear target.env-vars",
+            "settings clear target.run-args",
+            *_PRELUDE_COMMANDS,
+        ]
+        if self.target:
+            commands.append(f"target create {shlex.quote(self.target)}")
+        return commands
+
+    @staticmethod
+    def _session_reset_commands() -> list[str]:
+        return [
+            "process kill",
+            "settings clear target.env-vars",
+            "settings clear target.run-args",
+            *_PRELUDE_COMMANDS,
+        ]
+
+    def _execute(self, commands: list[str], timeout: int) -> dict[str, Any]:
+        sentinel = f"<<END:{uuid.uuid4().hex}>>"
+        script = "".join(f"{command}\n" for command in commands)
+        script += f'script print("{sentinel}")\n'
+
+        try:
+            assert self.proc.stdin is not None
+            self.proc.stdin.write(script.encode())
+            self.proc.stdin.flush()
+        except (OSError, ValueError) as e:  # ValueError: stdin already closed
+            self.close()
+            return {"success": False, "output": "", "error": str(e), "return_code": -1}
+
+        output: list[str] = []
+        deadline = time.monotonic() + timeout
+        while True:
+            try:
+                line = self._lines.get(timeout=max(deadline - time.monotonic(), 0))
+            except queue.Empty:
+                # The worker is in an unknown state (e.g. a hung inferior); discard it.
+                self.close()
+                return {
+                    "success": False,
+                    "output": "".join(output),
+                    "error": f"Commands timed out after {timeout} seconds",
+                    "return_code": -1,
+                }
+            if line is None:
+                stderr = b"".join(filter(None, self._stderr)).decode(errors="replace")
+                return {
+                    "success": False,
+                    "output": "".join(output),
+                    "error": stderr or "LLDB worker exited unexpectedly",
+                    "return_code": self.proc.wait(),
+                }
+            text = line.decode(errors="replace")
+            if sentinel in text:
+                if text.strip() == sentinel:
+                    break
+                continue  # LLDB's echo of the sentinel command itself
+            output.append(text)
+
+        return {"success": True, "output": "".join(output), "error": None, "return_code": 0}
+
+    def run(
+        self, commands: list[str], timeout: int, fast_mode: bool = True, keep_target: bool = False
+    ) -> dict[str, Any]:
+        """Run a batch of commands, then reset the worker for the next caller.
+
+        With keep_target the loaded target and its breakpoints survive the reset.
+        """
+        # `quit` would tear down the worker; the reset below does its job instead.
+        commands = [command for command in commands if command.strip() != "quit"]
+        with self.lock:
+            if not fast_mode:
+                self._execute([f"settings clear {name}" for name in _PRELUDE_SETTINGS], timeout=30)
+            result = self._execute(commands, timeout)
+            if self.alive:
+                reset = self._session_reset_commands() if keep_target else self._reset_commands()
+                self._execute(reset, timeout=30)
+        return result
+
+    def close(self) -> None:
+        """Ask LLDB to quit, killing it if it does not exit promptly."""
+        if not self.alive:
+            return
+        try:
+            assert self.proc.stdin is not None
+            self.proc.stdin.write(b"quit\n")
+            self.proc.stdin.close()
+            self.proc.wait(timeout=2)
+        except (OSError, subprocess.TimeoutExpired):
+            self.proc.kill()
+            self.proc.wait()
+
+
+# Workers keyed by (target, working_dir), least recently used first
+_workers: collections.OrderedDict[tuple[str | None, str | None], LldbWorker] = (
+    collections.OrderedDict()
+)
+_workers_lock = threading.Lock()
+
+
+def _acquire_worker(target: str | None, working_dir: str | None) -> LldbWorker:
+    """Return a live worker for the target/working directory, starting one if needed."""
+    key = (target, working_dir)
+
+    def pooled() -> LldbWorker | None:
+        worker = _workers.get(key)
+        if worker is not None and worker.alive:
+            _workers.move_to_end(key)
+            return worker
+        return None
+
+    with _workers_lock:
+        worker = pooled()
+    if worker is not None:
+        return worker
+
+    # Start LLDB outside the lock so a slow startup doesn't stall other lookups
+    fresh = LldbWorker(target, working_dir)
+    with _workers_lock:
+        worker = pooled()
+        if worker is None:
+            worker = _workers[key] = fresh
+            _workers.move_to_end(key)
+            stale = [_workers.popitem(last=False)[1] for _ in range(len(_workers) - MAX_WORKERS)]
+        else:
+            stale = [fresh]  # another call for this key got there first
+    for evicted in stale:
+        # Let a call already running on the worker finish before shutting it down
+        with evicted.lock:
+            evicted.close()
+    return worker
+
+
+@atexit.register
+def _shutdown_workers() -> None:
+    with _workers_lock:
+        while _workers:
+            _, worker = _workers.popitem()
+            worker.close()
+        for session in _sessions.values():
+            session.close()
+
+
+def _run_in_worker(
+    commands: list[str],
+    target: str | None,
+    working_dir: str | None,
+    timeout: int,
+    fast_mode: bool = True,
+) -> dict[str, Any]:
+    """Execute commands on a pooled persistent LLDB worker."""
+    try:
+        worker = _acquire_worker(target, working_dir)
+    except FileNotFoundError:
+        return {
+            "success": False,
+            "output": "",
+            "error": f"LLDB executable not found at '{LLDB_EXECUTABLE}'. Please ensure LLDB is installed and in PATH.",
+            "return_code": -1,
+        }
+    except _WorkerStartError as e:
+        return e.result
+    return worker.run(commands, timeout, fast_mode)
+
+
+# "Breakpoint 3: where = prog`main + 4 at main.c:5:3, address = 0x..." from `breakpoint set`
+_BREAKPOINT_SET_RE = re.compile(r"^Breakpoint (?P<id>\d+): (?P<where>.*)$", re.MULTILINE)
+
+
+def _session_worker(session: DebugSession, target: str, working_dir: str | None) -> LldbWorker:
+    """Return the session's LLDB process, (re)starting it for a new target or directory."""
+
+    def current() -> LldbWorker | None:
+        worker = session.process
+        if (
+            worker is not None
+            and worker.alive
+            and (worker.target, worker.working_dir) == (target, working_dir)
+        ):
+            return worker
+        return None
+
+    with _workers_lock:
+        worker = current()
+    if worker is not None:
+        return worker
+
+    # Start LLDB outside the lock so a slow startup doesn't stall other lookups
+    fresh = LldbWorker(target, working_dir)
+    with _workers_lock:
+        worker = current()
+        if worker is None:
+            worker, stale = fresh, session.process
+            session.process = fresh
+            session.target_path = target
+            session.breakpoints.clear()
+        else:
+            stale = fresh  # another call for this session got there first
+    if stale is not None:
+        stale.close()
+    return worker
+
+
+def _session_run(
+    session: DebugSession,
+    commands: list[str],
+    target: str,
+    working_dir: str | None,
+    timeout: int,
+) -> dict[str, Any]:
+    """Execute commands on a session's own persistent LLDB process.
+
+    The process is started on first use and keeps the session's target and
+    breakpoints between calls; only a launched program is killed after each
+    call. A `breakpoint set` the session has already run is skipped, so
+    repeated runs don't stack duplicate breakpoints. The process is restarted
+    when a call names a different executable or working directory, which
+    drops its breakpoints.
+    """
+    try:
+        worker = _session_worker(session, target, working_dir)
+    except FileNotFoundError:
+        return {
+            "success": False,
+            "output": "",
+            "error": f"LLDB executable not found at '{LLDB_EXECUTABLE}'. Please ensure LLDB is installed and in PATH.",
+            "return_code": -1,
+        }
+    except _WorkerStartError as e:
+        return e.result
+
+    known = {breakpoint.get("command") for breakpoint in session.breakpoints.values()}
+    commands = [
+        command
+        for command in commands
+        if not (command.startswith("breakpoint set") and command in known)
+    ]
+
+    session.is_running = True
+    try:
+        result = worker.run(commands, timeout, keep_target=True)
+    finally:
+        session.is_running = False
+    # Each `breakpoint set` reports one "Breakpoint N: ..." line, in order
+    set_commands = [command for command in commands if command.startswith("breakpoint set")]
+    for command, match in zip(set_commands, _BREAKPOINT_SET_RE.finditer(result["output"])):
+        session.breakpoints[int(match["id"])] = {"location": match["where"], "command": command}
+    session.last_output = result["output"]
+    return result
+
+
+async def _run_in_session(
+    session_id: str,
+    commands: list[str],
+    target: str,
     working_dir: str | None = None,
-    timeout: int = 30,
+    timeout: int = 60,
+) -> dict[str, Any]:
+    """Run commands in the named debug session, creating the session on first use."""
+    session = _touch(session_id) or _acquire_session(target, session_id)
+    return await asyncio.to_thread(_session_run, session, commands, target, working_dir, timeout)
+
+
+# =============================================================================
+# In-process SB API Backend
+# =============================================================================
+
+# LLDB's Python bindings and the one debugger shared by every call, loaded lazily
+_lldb: Any = None
+_sb_debugger: Any = None
+_sb_lock = threading.Lock()
+# Targets loaded through the SB API, keyed by real path -> (file version, SBTarget).
+# Guarded by its own lock so targets can be pre-warmed while _sb_lock is held.
+_sb_targets: dict[str, tuple[_FileVersion | None, Any]] = {}
+_sb_targets_lock = threading.RLock()
+# Background target loads started by _prewarm_target, keyed by real path
+_warm_targets: dict[str, concurrent.futures.Future[Any]] = {}
+_warm_targets_lock = threading.Lock()
+_prewarm_executor = concurrent.futures.ThreadPoolExecutor(
+    max_workers=4, thread_name_prefix="lldb-prewarm"
+)
+# Concurrent read-only SB API queries against one stopped process or core
+_sb_read_executor = concurrent.futures.ThreadPoolExecutor(
+    max_workers=4, thread_name_prefix="lldb-read"
+)
+
+_SB_RUN_PATTERN = re.compile(r"^(?:r|run)(?:\s+(?P<args>.*))?$")
+_SB_BACKTRACE_PATTERN = re.compile(r"^(?:bt|thread backtrace)(?:\s+(?P<args>.*))?$")
+_SB_STDIO_OPTIONS = {"-i", "-o", "-e", "--stdin", "--stdout", "--stderr", "--tty", "-t"}
+
+
+def _import_lldb() -> Any:
+    """Import LLDB's Python bindings, asking `lldb -P` where they live if needed."""
+    global _lldb
+    if _lldb is None:
+        try:
+            _lldb = importlib.import_module("lldb")
+        except ImportError:
+            proc = subprocess.run(
+                [LLDB_EXECUTABLE, "-P"], capture_output=True, text=True, timeout=30, check=False
+            )
+            sys.path.append(proc.stdout.strip())
+            _lldb = importlib.import_module("lldb")
+    return _lldb
+
+
+def _get_sb_debugger() -> Any:
+    """Return the shared synchronous SBDebugger, creating it on first use."""
+    global _sb_debugger
+    with _sb_targets_lock:
+        if _sb_debugger is not None:
+            return _sb_debugger
+        lldb = _import_lldb()
+        lldb.SBDebugger.Initialize()
+        debugger = lldb.SBDebugger.Create()
+        debugger.SetAsync(False)
+        for command in _PRELUDE_COMMANDS:
+            debugger.HandleCommand(command)
+        _sb_debugger = debugger
+        return _sb_debugger
+
+
+@atexit.register
+def _shutdown_sb_debugger() -> None:
+    global _sb_debugger
+    if _sb_debugger is not None:
+        for key in list(_paused):
+            _release_paused(_sb_debugger, key)
+        _lldb.SBDebugger.Destroy(_sb_debugger)
+        _lldb.SBDebugger.Terminate()
+        _sb_debugger = None
+
+
+def _sb_handle(debugger: Any, command: str) -> str:
+    """Run one command through the interpreter, formatted like batch-mode output."""
+    result = _lldb.SBCommandReturnObject()
+    debugger.GetCommandInterpreter().HandleCommand(command, result)
+    return f"(lldb) {command}\n{result.GetOutput() or ''}{result.GetError() or ''}"
+
+
+def _get_or_create_target(executable: str, working_dir: str | None = None) -> Any:
+    """Return the cached SBTarget for an executable, reloading it if the file changed.
+
+    Raises RuntimeError if LLDB cannot load the file.
+    """
+    debugger = _get_sb_debugger()
+    full_path = _canonical_path(executable, working_dir)
+    version = _file_version(full_path)
+    # Holding the lock also waits out a pre-warm of the same file still in flight
+    with _sb_targets_lock:
+        cached = _sb_targets.get(full_path)
+        if cached is not None and version is not None and cached[0] == version:
+            return cached[1]
+
+        if cached is not None:
+            del _sb_targets[full_path]
+            debugger.DeleteTarget(cached[1])
+        error = _lldb.SBError()
+        target = debugger.CreateTarget(full_path, None, None, True, error)
+        if not target.IsValid():
+            raise RuntimeError(error.GetCString() or f"unable to load {executable}")
+        _sb_targets[full_path] = (version, target)
+        return target
+
+
+def _prewarm_target(executable: str, working_dir: str | None = None) -> None:
+    """Start loading an executable's SBTarget in the background.
+
+    Called before a call queues for the shared debugger, so the target is
+    parsed while an earlier call is still running. Never blocks on a load.
+    """
+    full_path = _canonical_path(executable, working_dir)
+    cached = _sb_targets.get(full_path)
+    if cached is not None and cached[0] == _file_version(full_path):
+        return
+    with _warm_targets_lock:
+        pending = _warm_targets.get(full_path)
+        if pending is not None and not pending.done():
+            return
+        _warm_targets[full_path] = _prewarm_executor.submit(_get_or_create_target, full_path)
+
+
+def _sb_select_target(debugger: Any, path: str, working_dir: str | None) -> str:
+    """Select the cached target for path, reporting it like `target create` does."""
+    try:
+        target = _get_or_create_target(path, working_dir)
+    except RuntimeError as e:
+        return f"error: {e}\n"
+    debugger.SetSelectedTarget(target)
+    arch = target.GetTriple().split("-")[0]
+    return f"Current executable set to '{target.GetExecutable().fullpath}' ({arch}).\n"
+
+
+def _sb_launch_command(command: str, stdout_path: str, stderr_path: str, cwd: str | None) -> str:
+    """Rewrite run/process launch so the inferior's stdio can't reach the MCP pipes."""
+    match = _SB_RUN_PATTERN.match(command)
+    if match:
+        rest = f" -- {match.group('args')}" if match.group("args") else ""
+    elif command.startswith("process launch"):
+        rest = command[len("process launch") :]
+        if _SB_STDIO_OPTIONS.intersection(rest.split()):
+            return command
+    else:
+        return command
+    options = ["-i", os.devnull, "-o", stdout_path, "-e", stderr_path]
+    if cwd and "-w" not in rest.split():
+        options += ["-w", cwd]
+    return f"process launch {shlex.join(options)}{rest}"
+
+
+def _sb_frame(frame: Any) -> Frame:
+    """Describe an SBFrame the same way _parse_backtrace does."""
+    line_entry = frame.GetLineEntry()
+    file_spec = line_entry.GetFileSpec()
+    has_line = line_entry.IsValid() and file_spec.IsValid()
+    symbol_start = frame.GetSymbol().GetStartAddress()
+    offset = None
+    if not has_line and symbol_start.IsValid():
+        offset = frame.GetPCAddress().GetFileAddress() - symbol_start.GetFileAddress()
+    return Frame(
+        frame.GetFrameID(),
+        f"0x{frame.GetPC():016x}",
+        frame.GetModule().GetFileSpec().GetFilename(),
+        frame.GetDisplayFunctionName(),
+        offset,
+        file_spec.GetFilename() if has_line else None,
+        line_entry.GetLine() if has_line else None,
+    )
+
+
+def _sb_backtrace_frames(process: Any, args: str | None) -> list[Frame]:
+    """Collect structured frames for a `thread backtrace [all] [-c N]` command."""
+    tokens = shlex.split(args or "")
+    limit = None
+    for flag in ("-c", "--count"):
+        if flag in tokens[:-1]:
+            limit = int(tokens[tokens.index(flag) + 1])
+    threads = process.threads if "all" in tokens else [process.GetSelectedThread()]
+    return [_sb_frame(frame) for thread in threads for frame in thread.frames[:limit]]
+
+
+def _sb_reset(debugger: Any, fast_mode: bool) -> None:
+    """Kill inferiors and drop per-call state so the next caller starts clean."""
+    with _sb_targets_lock:
+        kept = [target for _, target in _sb_targets.values()]
+        paused = [entry.target for entry in _paused.values()]
+        for index in reversed(range(debugger.GetNumTargets())):
+            target = debugger.GetTargetAtIndex(index)
+            if any(target == owned for owned in paused):
+                continue
+            if target.GetProcess().IsValid():
+                target.GetProcess().Kill()
+            target.DeleteAllBreakpoints()
+            target.DeleteAllWatchpoints()
+            if not any(target == cached for cached in kept):
+                debugger.DeleteTarget(target)
+    for command in ("settings clear target.env-vars", "settings clear target.run-args"):
+        debugger.HandleCommand(command)
+    if not fast_mode:
+        for command in _PRELUDE_COMMANDS:
+            debugger.HandleCommand(command)
+
+
+def _run_in_sbapi(
+    commands: list[str],
+    target: str | None,
+    working_dir: str | None,
+    fast_mode: bool = True,
+) -> dict[str, Any]:
+    """Execute commands on the shared in-process SBDebugger."""
+    try:
+        debugger = _get_sb_debugger()
+    except (ImportError, OSError, subprocess.SubprocessError) as e:
+        return _sb_unavailable(e)
+
+    output: list[str] = []
+    frames: list[Frame] | None = None
+    with _sb_lock, tempfile.TemporaryDirectory(prefix="lldb_mcp_") as tmp:
+        stdout_path = os.path.join(tmp, "stdout")
+        stderr_path = os.path.join(tmp, "stderr")
+        try:
+            if not fast_mode:
+                for name in _PRELUDE_SETTINGS:
+                    debugger.HandleCommand(f"settings clear {name}")
+            if target:
+                output.append(_sb_select_target(debugger, target, working_dir))
+            for command in commands:
+                command = command.strip()
+                tokens = shlex.split(command) if command.startswith("target create") else []
+                if command == "quit":
+                    continue
+                if len(tokens) == 3:
+                    # Plain `target create <path>`: reuse the cached target
+                    output.append(f"(lldb) {command}\n")
+                    output.append(_sb_select_target(debugger, tokens[2], working_dir))
+                    continue
+
+                launch = _sb_launch_command(command, stdout_path, stderr_path, working_dir)
+                text = _sb_handle(debugger, launch)
+                output.append(text.replace(launch, command, 1))
+                if launch != command:
+                    for path in (stdout_path, stderr_path):
+                        if os.path.exists(path):
+                            with open(path, encoding="utf-8", errors="replace") as f:
+                                output.append(f.read())
+
+                backtrace = _SB_BACKTRACE_PATTERN.match(command)
+                process = debugger.GetSelectedTarget().GetProcess()
+                if backtrace and process.IsValid():
+                    frames = _sb_backtrace_frames(process, backtrace.group("args"))
+        except Exception as e:
+            return {"success": False, "output": "".join(output), "error": str(e), "return_code": -1}
+        finally:
+            _sb_reset(debugger, fast_mode)
+
+    result: dict[str, Any] = {
+        "success": True,
+        "output": "".join(output),
+        "error": None,
+        "return_code": 0,
+    }
+    if frames is not None:
+        result["frames"] = frames
+    return result
+
+
+def _sb_unavailable(error: Exception) -> dict[str, Any]:
+    """Result dict for when the LLDB Python bindings cannot be loaded."""
+    return {
+        "success": False,
+        "output": "",
+        "error": f"LLDB Python bindings not available: {error}",
+        "return_code": -1,
+    }
+
+
+def _sb_set_breakpoint(
+    executable: str, working_dir: str | None, location: str, condition: str | None
 ) -> dict[str, Any]:
+    """Create a breakpoint through the SB API and list the target's breakpoints.
+
+    The location and condition go to LLDB as plain arguments, so they are
+    never re-parsed as command text.
     """
-    Execute an LLDB command and return the output.
+    try:
+        debugger = _get_sb_debugger()
+    except (ImportError, OSError, subprocess.SubprocessError) as e:
+        return _sb_unavailable(e)
+
+    output: list[str] = []
+    with _sb_lock:
+        try:
+            output.append(_sb_select_target(debugger, executable, working_dir))
+            target = debugger.GetSelectedTarget()
+            loc = _LOC_RE.fullmatch(location)
+            if loc is None or loc["hex_end"]:
+                bp = target.BreakpointCreateByName(location)
+            elif loc["hex"]:
+                bp = target.BreakpointCreateByAddress(int(loc["hex"], 16))
+            else:
+                bp = target.BreakpointCreateByLocation(loc["file"], int(loc["line"]))
+            if not bp.IsValid():
+                raise RuntimeError(f"unable to set breakpoint at {location}")
+            if condition:
+                bp.SetCondition(condition)
+            output.append(_sb_handle(debugger, "breakpoint list"))
+        except Exception as e:
+            return {"success": False, "output": "".join(output), "error": str(e), "return_code": -1}
+        finally:
+            _sb_reset(debugger, True)
+
+    return {"success": True, "output": "".join(output), "error": None, "return_code": 0}
+
+
+class _PausedProcess(NamedTuple):
+    """A program left stopped at a breakpoint, with its own SBTarget."""
+
+    target: Any
+    stdio_dir: str
+    expires: float
+
+
+# Stopped processes keyed by (real path, file version, breakpoint, args), oldest
+# first. Guarded by _sb_lock.
+_PausedKey = tuple[str, _FileVersion | None, str, tuple[str, ...]]
+_paused: collections.OrderedDict[_PausedKey, _PausedProcess] = collections.OrderedDict()
+
+
+def _paused_key(executable: str, breakpoint: str, args: tuple[str, ...]) -> _PausedKey:
+    """Key a paused process by executable build, breakpoint and program arguments."""
+    full_path = _canonical_path(executable)
+    return (full_path, _file_version(full_path), breakpoint, args)
+
+
+def _release_paused(debugger: Any, key: _PausedKey) -> None:
+    """Kill a paused process and drop its target. Caller holds _sb_lock."""
+    entry = _paused.pop(key)
+    process = entry.target.GetProcess()
+    if process.IsValid():
+        process.Kill()
+    debugger.DeleteTarget(entry.target)
+    shutil.rmtree(entry.stdio_dir, ignore_errors=True)
+
+
+def _sb_query_paused(
+    executable: str, breakpoint: str, args: tuple[str, ...], queries: list[str]
+) -> dict[str, Any]:
+    """Run queries against the program stopped at breakpoint, launching it if needed.
 
-    This runs LLDB in batch mode for simple commands.
+    The stopped process is kept for _PAUSED_TTL seconds so later queries for
+    the same executable build, breakpoint and arguments skip the launch.
     """
-    cmd = [LLDB_EXECUTABLE]
+    try:
+        debugger = _get_sb_debugger()
+    except (ImportError, OSError, subprocess.SubprocessError) as e:
+        return _sb_unavailable(e)
+
+    key = _paused_key(executable, breakpoint, args)
+    full_path = key[0]
+    output: list[str] = []
+    with _sb_lock:
+        now = time.monotonic()
+        for stale in [k for k, entry in _paused.items() if entry.expires <= now]:
+            _release_paused(debugger, stale)
+        entry = _paused.get(key)
+        try:
+            if entry is None:
+                target = _get_or_create_target(full_path)
+                # The paused process owns this target; later calls load their own
+                with _sb_targets_lock:
+                    _sb_targets.pop(full_path, None)
+                entry = _paused[key] = _PausedProcess(
+                    target, tempfile.mkdtemp(prefix="lldb_mcp_"), now + _PAUSED_TTL
+                )
+                debugger.SetSelectedTarget(target)
+                output.append(_sb_handle(debugger, _breakpoint_command(breakpoint)))
+                run = _run_command(args)
+                stdio = [os.path.join(entry.stdio_dir, name) for name in ("stdout", "stderr")]
+                launch = _sb_launch_command(run, stdio[0], stdio[1], None)
+                output.append(_sb_handle(debugger, launch).replace(launch, run, 1))
+                for path in stdio:
+                    if os.path.exists(path):
+                        with open(path, encoding="utf-8", errors="replace") as f:
+                            output.append(f.read())
+            else:
+                debugger.SetSelectedTarget(entry.target)
+
+            process = entry.target.GetProcess()
+            stopped = process.IsValid() and process.GetState() == _lldb.eStateStopped
+            if stopped:
+                process.GetSelectedThread().SetSelectedFrame(0)
+            for query in queries:
+                output.append(_sb_handle(debugger, query))
+        except Exception as e:
+            if key in _paused:
+                _release_paused(debugger, key)
+            return {"success": False, "output": "".join(output), "error": str(e), "return_code": -1}
+
+        if stopped:
+            _paused[key] = entry._replace(expires=now + _PAUSED_TTL)
+            _paused.move_to_end(key)
+            while len(_paused) > _MAX_PAUSED:
+                _release_paused(debugger, next(iter(_paused)))
+        else:
+            # The program exited or crashed before reaching the breakpoint
+            _release_paused(debugger, key)
+
+    return {"success": True, "output": "".join(output), "error": None, "return_code": 0}
+
+
+def _sb_release_paused(executable: str | None, breakpoint: str | None) -> int:
+    """Release paused processes matching executable/breakpoint; return how many."""
+    if _sb_debugger is None:
+        return 0
+    full_path = _canonical_path(executable) if executable else None
+    with _sb_lock:
+        keys = [
+            key
+            for key in _paused
+            if (full_path is None or key[0] == full_path)
+            and (breakpoint is None or key[2] == breakpoint)
+        ]
+        for key in keys:
+            _release_paused(_sb_debugger, key)
+    return len(keys)
+
+
+def _sb_crash_report(executable: str, core_file: str, working_dir: str | None) -> dict[str, Any]:
+    """Load a core file and read the crash-analysis views of it concurrently.
+
+    The views are plain SB object reads rather than interpreter commands,
+    which are not safe to run from several threads at once. Output follows
+    the order and `(lldb) command` headers of the batch script.
+    """
+    try:
+        debugger = _get_sb_debugger()
+    except (ImportError, OSError, subprocess.SubprocessError) as e:
+        return _sb_unavailable(e)
+
+    with _sb_lock:
+        try:
+            target = _get_or_create_target(executable, working_dir)
+            process = target.LoadCore(os.path.join(working_dir or "", core_file))
+            if not process.IsValid():
+                raise RuntimeError(f"unable to load core file {core_file}")
+            frame = process.GetSelectedThread().GetSelectedFrame()
+            views: dict[str, Callable[[], str]] = {
+                "bt all": lambda: "".join(
+                    f"{thread}\n" + "".join(f"    {f}\n" for f in thread) for thread in process
+                ),
+                "register read": lambda: "".join(
+                    f"{register}\n" for register in next(iter(frame.GetRegisters()), ())
+                ),
+                "frame variable": lambda: "".join(
+                    f"{value}\n" for value in frame.GetVariables(True, True, False, True)
+                ),
+                "image list": lambda: "".join(
+                    f"[{index:3}] {module}\n" for index, module in enumerate(target.modules)
+                ),
+            }
+            futures = {name: _sb_read_executor.submit(view) for name, view in views.items()}
+            output = "".join(
+                f"(lldb) {name}\n{future.result()}" for name, future in futures.items()
+            )
+        except Exception as e:
+            return {"success": False, "output": "", "error": str(e), "return_code": -1}
+        finally:
+            _sb_reset(debugger, True)
+
+    return {"success": True, "output": output.rstrip(), "error": None, "return_code": 0}
+
+
+def _sb_instruction(target: Any, insn: Any) -> dict[str, Any]:
+    """Describe one SBInstruction as a JSON-ready dict."""
+    data = insn.GetData(target)
+    raw = data.ReadRawData(_lldb.SBError(), 0, data.GetByteSize()) or b""
+    return {
+        "address": hex(insn.GetAddress().GetFileAddress()),
+        "mnemonic": insn.GetMnemonic(target),
+        "operands": insn.GetOperands(target),
+        "comment": insn.GetComment(target) or None,
+        "bytes": raw.hex(),
+    }
+
+
+def _sb_read_instructions(executable: str, spec: str) -> dict[str, Any]:
+    """Decode instructions for a function name, address or address range.
 
+    Reads the executable's sections directly, so LLDB's disassembly text is
+    never produced or parsed.
+    """
+    try:
+        _get_sb_debugger()
+    except (ImportError, OSError, subprocess.SubprocessError) as e:
+        return _sb_unavailable(e)
+
+    with _sb_lock:
+        try:
+            target = _get_or_create_target(executable)
+            loc = _LOC_RE.fullmatch(spec)
+            if loc and loc["hex"]:
+                start = int(loc["hex"], 16)
+                end = int(loc["hex_end"], 16) if loc["hex_end"] else None
+                # Every instruction is at least one byte, so a range never needs more
+                count = max(end - start, 0) if end is not None else 50
+                insns = [
+                    insn
+                    for insn in target.ReadInstructions(target.ResolveFileAddress(start), count)
+                    if end is None or insn.GetAddress().GetFileAddress() < end
+                ]
+            else:
+                insns = []
+                for context in target.FindFunctions(spec):
+                    owner = context.GetFunction()
+                    if not owner.IsValid():
+                        owner = context.GetSymbol()
+                    insns.extend(owner.GetInstructions(target))
+            instructions = [_sb_instruction(target, insn) for insn in insns]
+        except Exception as e:
+            return {"success": False, "output": "", "error": str(e), "return_code": -1}
+
+    return {
+        "success": True,
+        "output": "",
+        "error": None,
+        "return_code": 0,
+        "instructions": instructions,
+    }
+
+
+def _sb_read_memory(executable: str, address: int, count: int) -> dict[str, Any]:
+    """Read bytes at a file address from the executable's sections."""
+    try:
+        _get_sb_debugger()
+    except (ImportError, OSError, subprocess.SubprocessError) as e:
+        return _sb_unavailable(e)
+
+    with _sb_lock:
+        try:
+            target = _get_or_create_target(executable)
+            error = _lldb.SBError()
+            data = target.ReadMemory(target.ResolveFileAddress(address), count, error)
+            if error.Fail():
+                raise RuntimeError(error.GetCString() or f"unable to read {hex(address)}")
+        except Exception as e:
+            return {"success": False, "output": "", "error": str(e), "return_code": -1}
+
+    return {"success": True, "output": "", "error": None, "return_code": 0, "bytes": data.hex()}
+
+
+def _interrupt_sbapi() -> None:
+    """Unblock a timed-out SB API call by interrupting LLDB and killing inferiors."""
+    debugger = _sb_debugger
+    if debugger is None:
+        return
+    request_interrupt = getattr(debugger, "RequestInterrupt", None)
+    if request_interrupt is not None:
+        request_interrupt()
+    for index in range(debugger.GetNumTargets()):
+        process = debugger.GetTargetAtIndex(index).GetProcess()
+        if process.IsValid():
+            process.Kill()
+
+
+async def _run_sbapi(
+    commands: list[str],
+    target: str | None,
+    working_dir: str | None,
+    timeout: int,
+    fast_mode: bool = True,
+) -> dict[str, Any]:
+    """Run commands on the SB API backend from a thread, bounded by timeout."""
     if target:
-        cmd.extend(["--file", target])
+        _prewarm_target(target, working_dir)
+    return await _sb_call(
+        functools.partial(_run_in_sbapi, commands, target, working_dir, fast_mode), timeout
+    )
 
-    # Add batch commands
-    cmd.extend(["--batch", "-o", command])
 
-    if args:
-        cmd.append("--")
-        cmd.extend(args)
+async def _sb_call(func: Callable[[], dict[str, Any]], timeout: int) -> dict[str, Any]:
+    """Run an SB API job from a thread, interrupting LLDB if it exceeds timeout."""
+    try:
+        return await asyncio.wait_for(asyncio.to_thread(func), timeout=timeout)
+    except asyncio.TimeoutError:
+        _interrupt_sbapi()
+        return {
+            "success": False,
+            "output": "",
+            "error": f"Commands timed out after {timeout} seconds",
+            "return_code": -1,
+        }
+
+
+def _prelude_args(fast_mode: bool) -> list[str]:
+    """Return `-O` flags applying the session prelude before the target loads."""
+    if not fast_mode:
+        return []
+    return [arg for command in _PRELUDE_COMMANDS for arg in ("-O", command)]
+
+
+def _decode_output(buf: bytearray) -> str:
+    """Decode batch output once, without the prelude echo or trailing whitespace.
+
+    Trimming happens on the buffer so tools that ``.strip()`` the result
+    don't copy a multi-megabyte string a second time.
+    """
+    start = len(_PRELUDE_ECHO) if buf.startswith(_PRELUDE_ECHO) else 0
+    end = len(buf)
+    while end > start and buf[end - 1] in b" \t\r\n":
+        end -= 1
+    return str(memoryview(buf)[start:end], "utf-8", "replace")
+
+
+async def _read_stream(stream: asyncio.StreamReader | None) -> bytearray:
+    """Collect a pipe into a single growing buffer as data arrives."""
+    buf = bytearray()
+    if stream is None:
+        return buf
+    while chunk := await stream.read(_READ_CHUNK):
+        buf += chunk
+    return buf
+
+
+# One semaphore per event loop; asyncio primitives can't be shared between loops
+_spawn_limits: weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, asyncio.Semaphore] = (
+    weakref.WeakKeyDictionary()
+)
+
+
+def _spawn_limit() -> asyncio.Semaphore:
+    """Return the running loop's semaphore bounding concurrent LLDB processes."""
+    loop = asyncio.get_running_loop()
+    limit = _spawn_limits.get(loop)
+    if limit is None:
+        limit = _spawn_limits[loop] = asyncio.Semaphore(MAX_LLDB_PROCS)
+    return limit
+
 
+async def _exec_lldb(
+    cmd: list[str], *, timeout: int, cwd: str | None, drop_stderr: bool = False
+) -> dict[str, Any]:
+    """Run an LLDB batch command line and package its outcome as a result dict."""
     try:
-        result = subprocess.run(
-            cmd, capture_output=True, text=True, timeout=timeout, cwd=working_dir or os.getcwd()
-        )
+        async with _spawn_limit():
+            proc = await asyncio.create_subprocess_exec(
+                *cmd,
+                stdin=asyncio.subprocess.DEVNULL,
+                stdout=asyncio.subprocess.PIPE,
+                stderr=asyncio.subprocess.DEVNULL if drop_stderr else asyncio.subprocess.PIPE,
+                cwd=cwd or None,
+            )
+            try:
+                stdout, stderr, _ = await asyncio.wait_for(
+                    asyncio.gather(
+                        _read_stream(proc.stdout), _read_stream(proc.stderr), proc.wait()
+                    ),
+                    timeout=timeout,
+                )
+            except asyncio.TimeoutError:
+                proc.kill()
+                await proc.wait()
+                raise
         return {
-            "success": result.returncode == 0,
-            "output": result.stdout,
-            "error": result.stderr if result.returncode != 0 else None,
-            "return_code": result.returncode,
+            "success": proc.returncode == 0,
+            "output": _decode_output(stdout),
+            "error": _batch_error(proc.returncode, None if drop_stderr else stderr),
+            "return_code": proc.returncode,
         }
-    except subprocess.TimeoutExpired:
+    except asyncio.TimeoutError:
         return {
             "success": False,
             "output": "",
-            "error": f"Command timed out after {timeout} seconds",
+            "error": f"Commands timed out after {timeout} seconds",
             "return_code": -1,
         }
     except FileNotFoundError:
@@ -116,51 +1231,183 @@ def _run_lldb_command(
         return {"success": False, "output": "", "error": str(e), "return_code": -1}
 
 
-def _run_lldb_script(
+def _batch_error(return_code: int | None, stderr: bytearray | None) -> str | None:
+    """Describe a failed batch run from its exit code and (possibly dropped) stderr."""
+    if return_code == 0:
+        return None
+    if stderr is None:
+        return f"LLDB exited with code {return_code}"
+    return stderr.decode("utf-8", errors="replace")
+
+
+async def _run_lldb_command(
+    command: str,
+    target: str | None = None,
+    args: list[str] | None = None,
+    working_dir: str | None = None,
+    timeout: int = 30,
+    fast_mode: bool = True,
+    drop_stderr: bool = False,
+) -> dict[str, Any]:
+    """
+    Execute an LLDB command and return the output.
+
+    This runs LLDB in batch mode for simple commands. With fast_mode the
+    session prelude settings are applied first; pass False for stock LLDB
+    behavior (e.g. when pretty printers or exact memory semantics matter).
+    Callers that only use stdout can pass drop_stderr to discard LLDB's
+    stderr instead of piping it back.
+
+    Target-less metadata queries (help, version, ...) are answered from a
+    cache that persists across server runs for the same LLDB binary and init files.
+    """
+    if target or args or not _is_static_command(command):
+        return await _run_lldb_command_uncached(
+            command, target, args, working_dir, timeout, fast_mode, drop_stderr
+        )
+
+    key = (command.strip(), fast_mode)
+    # Hashing the LLDB binary and reading the cache file stay off the event loop
+    await asyncio.to_thread(_load_static_cache)
+    cached = _static_lookup(key)
+    if cached is not None:
+        return cached
+    result = await _run_lldb_command_uncached(
+        command, None, None, working_dir, timeout, fast_mode, drop_stderr
+    )
+    if result["success"]:
+        _static_store(key, result)
+    return result
+
+
+async def _run_lldb_command_uncached(
+    command: str,
+    target: str | None,
+    args: list[str] | None,
+    working_dir: str | None,
+    timeout: int,
+    fast_mode: bool,
+    drop_stderr: bool,
+) -> dict[str, Any]:
+    """Run a single command on the configured backend (see _run_lldb_command)."""
+    if LLDB_BACKEND in ("persistent", "sbapi"):
+        commands = [command]
+        if args:
+            commands.insert(0, f"settings set -- target.run-args {shlex.join(args)}")
+        if LLDB_BACKEND == "sbapi":
+            return await _run_sbapi(commands, target, working_dir, timeout, fast_mode)
+        return await asyncio.to_thread(
+            _run_in_worker, commands, target, working_dir, timeout, fast_mode
+        )
+
+    cmd = [LLDB_EXECUTABLE, *_prelude_args(fast_mode)]
+
+    if target:
+        cmd.extend(["--file", target])
+
+    # Add batch commands; quit even if the inferior crashes (see _BATCH_ON_CRASH)
+    cmd.extend(["--batch", *_BATCH_ON_CRASH, "-o", command])
+
+    if args:
+        cmd.append("--")
+        cmd.extend(args)
+
+    return await _exec_lldb(cmd, timeout=timeout, cwd=working_dir, drop_stderr=drop_stderr)
+
+
+async def _run_lldb_script(
     commands: list[str],
     target: str | None = None,
     working_dir: str | None = None,
     timeout: int = 60,
+    fast_mode: bool = True,
+    drop_stderr: bool = False,
 ) -> dict[str, Any]:
     """
     Execute multiple LLDB commands in sequence.
+
+    fast_mode and drop_stderr have the same meaning as for _run_lldb_command.
     """
-    cmd = [LLDB_EXECUTABLE]
+    if LLDB_BACKEND == "sbapi":
+        return await _run_sbapi(commands, target, working_dir, timeout, fast_mode)
+    if LLDB_BACKEND == "persistent":
+        return await asyncio.to_thread(
+            _run_in_worker, commands, target, working_dir, timeout, fast_mode
+        )
+
+    cmd = [LLDB_EXECUTABLE, *_prelude_args(fast_mode)]
 
     if target:
         cmd.extend(["--file", target])
 
-    cmd.append("--batch")
+    cmd.extend(["--batch", *_BATCH_ON_CRASH])
 
     for command in commands:
         cmd.extend(["-o", command])
 
-    try:
-        result = subprocess.run(
-            cmd, capture_output=True, text=True, timeout=timeout, cwd=working_dir or os.getcwd()
+    return await _exec_lldb(cmd, timeout=timeout, cwd=working_dir, drop_stderr=drop_stderr)
+
+
+async def _run_stopped(
+    executable: str,
+    breakpoint: str | None,
+    args: list[str] | None,
+    queries: list[str],
+    core_file: str | None = None,
+    timeout: int = 60,
+    drop_stderr: bool = False,
+) -> dict[str, Any]:
+    """Run queries with the program stopped at a function breakpoint or in a core dump.
+
+    A core file is loaded directly, so nothing is launched. For a breakpoint,
+    the SB API backend keeps the stopped process between calls, so queries
+    that share an executable, breakpoint and arguments launch it only once.
+    Other backends run the whole script each time.
+    """
+    if core_file:
+        commands = [_core_target_command(executable, core_file), *queries]
+        return await _run_lldb_script(commands, timeout=timeout, drop_stderr=drop_stderr)
+    if breakpoint is None:
+        raise ValueError("Either 'breakpoint' or 'core_file' must be provided")
+
+    if LLDB_BACKEND == "sbapi":
+        program_args = tuple(args or ())
+        if _paused_key(executable, breakpoint, program_args) not in _paused:
+            _prewarm_target(executable)
+        return await _sb_call(
+            functools.partial(_sb_query_paused, executable, breakpoint, program_args, queries),
+            timeout,
         )
-        return {
-            "success": result.returncode == 0,
-            "output": result.stdout,
-            "error": result.stderr if result.returncode != 0 else None,
-            "return_code": result.returncode,
-        }
-    except subprocess.TimeoutExpired:
-        return {
-            "success": False,
-            "output": "",
-            "error": f"Commands timed out after {timeout} seconds",
-            "return_code": -1,
-        }
-    except Exception as e:
-        return {"success": False, "output": "", "error": str(e), "return_code": -1}
+    commands = _build_inspect_script(breakpoint, args, queries)
+    return await _run_lldb_script(
+        commands, target=executable, timeout=timeout, drop_stderr=drop_stderr
+    )
 
 
 # =============================================================================
 # Initialize MCP Server
 # =============================================================================
 
-mcp = FastMCP(SERVER_NAME)
+
+@contextlib.asynccontextmanager
+async def _lifespan(server: FastMCP) -> AsyncIterator[None]:
+    """Warm the help/version cache in the background while the server runs.
+
+    The prewarm splits one run's output on LLDB's "(lldb) <command>" echo, which
+    batch runs and the SB API backend produce but persistent workers don't, so
+    it is skipped there rather than run for nothing.
+    """
+    if LLDB_BACKEND == "persistent":
+        yield
+        return
+    prewarm = asyncio.create_task(_prewarm_static_cache())
+    try:
+        yield
+    finally:
+        prewarm.cancel()
+
+
+mcp = FastMCP(SERVER_NAME, lifespan=_lifespan)
 
 
 # =============================================================================
@@ -175,10 +1422,18 @@ class ResponseFormat(str, Enum):
     JSON = "json"
 
 
-class RunCommandInput(BaseModel):
-    """Input for running arbitrary LLDB commands."""
+class BaseInput(BaseModel):
+    """Common configuration for tool inputs.
+
+    Inputs are immutable once validated and reject unknown fields, so a
+    misspelled parameter is reported instead of silently ignored.
+    """
+
+    model_config = ConfigDict(str_strip_whitespace=True, frozen=True, extra="forbid")
+
 
-    model_config = ConfigDict(str_strip_whitespace=True)
+class RunCommandInput(BaseInput):
+    """Input for running arbitrary LLDB commands."""
 
     command: str = Field(
         ...,
@@ -192,11 +1447,9 @@ class RunCommandInput(BaseModel):
     working_dir: str | None = Field(default=None, description="Working directory for the command")
 
 
-class AnalyzeCrashInput(BaseModel):
+class AnalyzeCrashInput(BaseInput):
     """Input for analyzing a crashed program."""
 
-    model_config = ConfigDict(str_strip_whitespace=True)
-
     executable: str = Field(..., description="Path to the executable that crashed", min_length=1)
     core_file: str | None = Field(default=None, description="Path to the core dump file (optional)")
     response_format: ResponseFormat = Field(
@@ -206,11 +1459,9 @@ class AnalyzeCrashInput(BaseModel):
     working_dir: str | None = Field(default=None, description="Working directory for the analysis")
 
 
-class SetBreakpointInput(BaseModel):
+class SetBreakpointInput(BaseInput):
     """Input for setting breakpoints."""
 
-    model_config = ConfigDict(str_strip_whitespace=True)
-
     executable: str = Field(..., description="Path to the executable", min_length=1)
     location: str = Field(
         ...,
@@ -221,15 +1472,25 @@ class SetBreakpointInput(BaseModel):
         default=None, description="Conditional expression for the breakpoint (e.g., 'i > 10')"
     )
     working_dir: str | None = Field(default=None, description="Working directory for the session")
+    session_id: str | None = Field(
+        default=None,
+        description="Debug session to run in; calls sharing a session ID reuse one LLDB process that keeps the executable and earlier breakpoints loaded",
+        min_length=1,
+    )
 
 
-class ExamineVariablesInput(BaseModel):
+class ExamineVariablesInput(BaseInput):
     """Input for examining variables."""
 
-    model_config = ConfigDict(str_strip_whitespace=True)
-
     executable: str = Field(..., description="Path to the executable", min_length=1)
-    breakpoint: str = Field(..., description="Breakpoint location to stop at", min_length=1)
+    breakpoint: str | None = Field(
+        default=None, description="Breakpoint location to stop at", min_length=1
+    )
+    core_file: str | None = Field(
+        default=None,
+        description="Core dump to inspect instead of running to a breakpoint",
+        validate_default=True,
+    )
     variables: list[str] | None = Field(
         default=None, description="Specific variable names to examine (if None, shows all locals)"
     )
@@ -240,11 +1501,55 @@ class ExamineVariablesInput(BaseModel):
         default=ResponseFormat.MARKDOWN, description="Output format"
     )
 
+    @field_validator("core_file")
+    @classmethod
+    def validate_breakpoint_or_core(cls, v: str | None, info: ValidationInfo) -> str | None:
+        if (v is None) == (info.data.get("breakpoint") is None):
+            raise ValueError("Exactly one of 'breakpoint' or 'core_file' must be provided")
+        return v
 
-class DisassembleInput(BaseModel):
-    """Input for disassembling code."""
 
-    model_config = ConfigDict(str_strip_whitespace=True)
+class InspectInput(BaseInput):
+    """Input for inspecting program state at a breakpoint in a single run."""
+
+    executable: str = Field(..., description="Path to the executable", min_length=1)
+    breakpoint: str = Field(..., description="Breakpoint location to stop at", min_length=1)
+    args: list[str] | None = Field(
+        default=None, description="Command-line arguments to pass to the program"
+    )
+    include: list[Literal["bt", "vars", "regs", "disasm", "memory"]] = Field(
+        default=["bt", "vars"],
+        description="What to collect once stopped: 'bt' (backtrace), 'vars' (frame variables), "
+        "'regs' (registers), 'disasm' (current function), 'memory' (needs memory_address)",
+        min_length=1,
+    )
+    variables: list[str] | None = Field(
+        default=None, description="Specific variable names for 'vars' (if None, shows all locals)"
+    )
+    register_set: str = Field(
+        default="general",
+        description="Register set for 'regs': 'general', 'float', 'vector', 'all'",
+    )
+    memory_address: str | None = Field(
+        default=None,
+        description="Address or expression to read for 'memory' (e.g., '0x7fff5fbff000', '&buf')",
+        validate_default=True,
+    )
+    memory_count: int = Field(default=64, description="Bytes to read for 'memory'", ge=1, le=4096)
+    response_format: ResponseFormat = Field(
+        default=ResponseFormat.MARKDOWN, description="Output format"
+    )
+
+    @field_validator("memory_address")
+    @classmethod
+    def validate_memory_address(cls, v: str | None, info: ValidationInfo) -> str | None:
+        if v is None and "memory" in info.data.get("include", []):
+            raise ValueError("'memory_address' is required when include has 'memory'")
+        return v
+
+
+class DisassembleInput(BaseInput):
+    """Input for disassembling code."""
 
     executable: str = Field(..., description="Path to the executable", min_length=1)
     target: str = Field(
@@ -254,13 +1559,14 @@ class DisassembleInput(BaseModel):
     )
     show_bytes: bool = Field(default=False, description="Show opcode bytes alongside instructions")
     mixed: bool = Field(default=False, description="Show mixed source and assembly")
+    response_format: ResponseFormat = Field(
+        default=ResponseFormat.MARKDOWN, description="Output format"
+    )
 
 
-class ReadMemoryInput(BaseModel):
+class ReadMemoryInput(BaseInput):
     """Input for reading memory."""
 
-    model_config = ConfigDict(str_strip_whitespace=True)
-
     executable: str = Field(..., description="Path to the executable", min_length=1)
     address: str = Field(
         ..., description="Memory address to read from (hex, e.g., '0x7fff5fbff000')", min_length=1
@@ -273,12 +1579,21 @@ class ReadMemoryInput(BaseModel):
     breakpoint: str | None = Field(
         default=None, description="Breakpoint location to stop at before reading memory"
     )
+    core_file: str | None = Field(default=None, description="Core dump to read memory from")
+    response_format: ResponseFormat = Field(
+        default=ResponseFormat.MARKDOWN, description="Output format"
+    )
 
+    @field_validator("core_file")
+    @classmethod
+    def validate_breakpoint_or_core(cls, v: str | None, info: ValidationInfo) -> str | None:
+        if v is not None and info.data.get("breakpoint") is not None:
+            raise ValueError("Pass either 'breakpoint' or 'core_file', not both")
+        return v
 
-class EvaluateExpressionInput(BaseModel):
-    """Input for evaluating expressions."""
 
-    model_config = ConfigDict(str_strip_whitespace=True)
+class EvaluateExpressionInput(BaseInput):
+    """Input for evaluating expressions."""
 
     executable: str = Field(..., description="Path to the executable", min_length=1)
     expression: str = Field(
@@ -286,18 +1601,28 @@ class EvaluateExpressionInput(BaseModel):
         description="C/C++ expression to evaluate (e.g., 'sizeof(int)', 'ptr->member', 'array[5]')",
         min_length=1,
     )
-    breakpoint: str = Field(
-        ..., description="Breakpoint location for evaluation context", min_length=1
+    breakpoint: str | None = Field(
+        default=None, description="Breakpoint location for evaluation context", min_length=1
+    )
+    core_file: str | None = Field(
+        default=None,
+        description="Core dump to inspect instead of running to a breakpoint",
+        validate_default=True,
     )
     args: list[str] | None = Field(
         default=None, description="Command-line arguments to pass to the program"
     )
 
+    @field_validator("core_file")
+    @classmethod
+    def validate_breakpoint_or_core(cls, v: str | None, info: ValidationInfo) -> str | None:
+        if (v is None) == (info.data.get("breakpoint") is None):
+            raise ValueError("Exactly one of 'breakpoint' or 'core_file' must be provided")
+        return v
 
-class BacktraceInput(BaseModel):
-    """Input for getting a backtrace."""
 
-    model_config = ConfigDict(str_strip_whitespace=True)
+class BacktraceInput(BaseInput):
+    """Input for getting a backtrace."""
 
     executable: str = Field(..., description="Path to the executable", min_length=1)
     breakpoint: str | None = Field(
@@ -316,173 +1641,707 @@ class BacktraceInput(BaseModel):
     )
 
 
-class ListSourceInput(BaseModel):
-    """Input for listing source code."""
+class ListSourceInput(BaseInput):
+    """Input for listing source code."""
+
+    executable: str = Field(..., description="Path to the executable", min_length=1)
+    file: str | None = Field(
+        default=None, description="Source file to list (if None, lists around current location)"
+    )
+    line: int | None = Field(default=None, description="Line number to center on", ge=1)
+    count: int = Field(default=20, description="Number of lines to show", ge=1, le=500)
+    function: str | None = Field(default=None, description="Show source for a specific function")
+
+
+class SymbolLookupInput(BaseInput):
+    """Input for looking up symbols."""
+
+    executable: str = Field(..., description="Path to the executable", min_length=1)
+    query: str = Field(..., description="Symbol name or pattern to search for", min_length=1)
+    query_type: str = Field(
+        default="name",
+        description="Type of lookup: 'name' (exact), 'regex' (pattern), 'address' (hex address), 'type' (type name)",
+    )
+
+
+class RegistersInput(BaseInput):
+    """Input for viewing registers."""
+
+    executable: str = Field(..., description="Path to the executable", min_length=1)
+    breakpoint: str | None = Field(
+        default=None, description="Breakpoint location to stop at", min_length=1
+    )
+    core_file: str | None = Field(
+        default=None,
+        description="Core dump to inspect instead of running to a breakpoint",
+        validate_default=True,
+    )
+    register_set: str = Field(
+        default="general",
+        description="Register set to display: 'general', 'float', 'vector', 'all'",
+    )
+    specific_registers: list[str] | None = Field(
+        default=None, description="Specific register names to show (e.g., ['rax', 'rbx', 'rsp'])"
+    )
+    args: list[str] | None = Field(
+        default=None, description="Command-line arguments to pass to the program"
+    )
+
+    @field_validator("core_file")
+    @classmethod
+    def validate_breakpoint_or_core(cls, v: str | None, info: ValidationInfo) -> str | None:
+        if (v is None) == (info.data.get("breakpoint") is None):
+            raise ValueError("Exactly one of 'breakpoint' or 'core_file' must be provided")
+        return v
+
+
+class WatchpointInput(BaseInput):
+    """Input for setting watchpoints."""
+
+    executable: str = Field(..., description="Path to the executable", min_length=1)
+    variable: str = Field(..., description="Variable name or memory address to watch", min_length=1)
+    watch_type: str = Field(
+        default="write", description="Type of access to watch: 'write', 'read', 'read_write'"
+    )
+    condition: str | None = Field(
+        default=None, description="Conditional expression for the watchpoint"
+    )
+
+
+class RunProgramInput(BaseInput):
+    """Input for running a program with debugging."""
+
+    executable: str = Field(..., description="Path to the executable to run", min_length=1)
+    args: list[str] | None = Field(
+        default=None, description="Command-line arguments to pass to the program"
+    )
+    breakpoints: list[str] | None = Field(
+        default=None, description="List of breakpoint locations to set before running"
+    )
+    environment: dict[str, str] | None = Field(
+        default=None, description="Environment variables to set"
+    )
+    stop_at_entry: bool = Field(default=True, description="Stop at the entry point (main function)")
+    working_dir: str | None = Field(default=None, description="Working directory for the program")
+    session_id: str | None = Field(
+        default=None,
+        description="Debug session to run in; calls sharing a session ID reuse one LLDB process that keeps the executable and earlier breakpoints loaded",
+        min_length=1,
+    )
+
+
+class AttachProcessInput(BaseInput):
+    """Input for attaching to a running process."""
+
+    pid: int | None = Field(default=None, description="Process ID to attach to", ge=1)
+    name: str | None = Field(default=None, description="Process name to attach to")
+    wait_for: bool = Field(
+        default=False, description="Wait for the process to launch if using name"
+    )
+
+    @field_validator("name")
+    @classmethod
+    def validate_pid_or_name(cls, v: str | None, info: ValidationInfo) -> str | None:
+        if v is None and info.data.get("pid") is None:
+            raise ValueError("Either 'pid' or 'name' must be provided")
+        return v
+
+
+class ThreadsInput(BaseInput):
+    """Input for examining threads."""
+
+    executable: str = Field(..., description="Path to the executable", min_length=1)
+    breakpoint: str | None = Field(default=None, description="Breakpoint location to stop at")
+    core_file: str | None = Field(default=None, description="Path to core dump file")
+    show_backtrace: bool = Field(default=False, description="Show backtrace for each thread")
+
+
+class ImageListInput(BaseInput):
+    """Input for listing loaded images/modules."""
+
+    executable: str = Field(..., description="Path to the executable", min_length=1)
+    filter_pattern: str | None = Field(default=None, description="Filter images by name pattern")
+
+
+class ReleaseSessionInput(BaseInput):
+    """Input for releasing programs kept stopped at a breakpoint, or a debug session."""
+
+    session_id: str | None = Field(
+        default=None,
+        description="Close this debug session (from lldb_set_breakpoint/lldb_run), ending its LLDB process and breakpoints",
+        min_length=1,
+    )
+    executable: str | None = Field(
+        default=None, description="Only release sessions for this executable"
+    )
+    breakpoint: str | None = Field(
+        default=None, description="Only release sessions stopped at this breakpoint"
+    )
+
+
+# =============================================================================
+# Helper Functions
+# =============================================================================
+
+# One backtrace frame per line, e.g.
+#   frame #0: 0x0000555555555131 simple`add(a=3, b=4) at simple.cpp:5:12
+# Anchored at both ends of the line: the start lets the regex engine reject
+# thread banners and other non-frame lines immediately, and the end makes the
+# lazy module/function groups expand fully.
+_FRAME_PATTERN = re.compile(
+    r"^[ \t]*(?:\*[ \t]*)?frame #(\d+): (0x[0-9a-fA-F]+) (.+?)(?:`(.+?))?(?:\s+\+\s+(\d+))?"
+    r"(?:\s+at\s+(.+?):(\d+)(?::\d+)?)?\s*$",
+    re.MULTILINE,
+)
+
+# `image lookup` options for each lldb_symbols query_type; unknown types look up by name
+_SYMBOL_LOOKUP = {
+    "name": "--name",
+    "regex": "--regex --name",
+    "address": "--address",
+    "type": "--type",
+}
+
+# Vector (SSE/AVX) registers are usually set 2. An 'all' dump is bracketed by
+# marker lines, which every backend prints alike, and sets past the general
+# and float ones are dropped once the dump would exceed this many characters
+_VECTOR_REGISTERS = "register read --set 2"
+_REGISTER_BUDGET = 64 * 1024
+_REGISTERS_BEGIN = "<<<REGISTERS>>>"
+_REGISTERS_END = "<<<END REGISTERS>>>"
+_REGISTER_SET_RE = re.compile(r"^(?P<name>\S[^\n]*):$", re.MULTILINE)
+
+# Location grammars accepted by the breakpoint and disassembly tools: a hex
+# address or address range, or file:line. Anything else is a symbol name.
+_LOC_RE = re.compile(
+    r"(?P<hex>0x[0-9a-fA-F]+)(?:-(?P<hex_end>0x[0-9a-fA-F]+))?|(?P<file>.+):(?P<line>\d+)"
+)
+
+# Markdown response templates, one per tool, filled with str.format
+_TMPL_CRASH = "# Crash Analysis: {name}\n\n{core}{body}"
+_TMPL_VARIABLES = "## Variables at `{stop}`\n\n```\n{body}\n```"
+_TMPL_INSPECT = "## State at `{breakpoint}`\n\n```\n{body}\n```"
+_TMPL_DISASM = "## Disassembly: `{target}`\n\n```asm\n{body}\n```"
+_TMPL_MEMORY = "## Memory at `{address}`\n\n```\n{body}\n```"
+_TMPL_EXPRESSION = "## Expression: `{expression}`\n\n```\n{body}\n```"
+_TMPL_BACKTRACE = "## Stack Backtrace\n\n```\n{body}\n```"
+_TMPL_SOURCE = "## {title}\n\n```cpp\n{body}\n```"
+_TMPL_SYMBOLS = "## Symbol Lookup: `{query}`\n\n```\n{body}\n```"
+_TMPL_REGISTERS = "## Registers at `{stop}`\n\n```\n{body}\n```"
+_TMPL_WATCHPOINT = "## Watchpoint on `{variable}`\n\n```\n{body}\n```"
+_TMPL_RUN = "## Program Run: `{name}`\n\n```\n{body}\n```"
+_TMPL_THREADS = "## Threads\n\n```\n{body}\n```"
+_TMPL_IMAGES = "## Loaded Images\n\n```\n{body}\n```"
+_TMPL_HELP = "## LLDB Help{topic}\n\n```\n{body}\n```"
+_TMPL_VERSION = "## LLDB Version\n\n```\n{body}\n```"
+
+
+@functools.cache
+def _orjson() -> Any:
+    """Import orjson, an optional and much faster JSON encoder, on first use.
+
+    Most sessions never ask for JSON output, so server startup doesn't pay
+    for the import. Returns None when orjson isn't installed.
+    """
+    try:
+        return importlib.import_module("orjson")
+    except ImportError:
+        return None
+
+
+def _dumps(data: Any) -> str:
+    """Serialize tool output as indented JSON, using orjson when it is installed."""
+    orjson = _orjson()
+    if orjson is not None:
+        encoded: bytes = orjson.dumps(data, option=orjson.OPT_INDENT_2)
+        return encoded.decode()
+    return json.dumps(data, indent=2)
+
+
+def _format_output(data: dict[str, Any], format_type: ResponseFormat) -> str:
+    """Format output based on requested format."""
+    if format_type is ResponseFormat.JSON:
+        return _dumps(data)
+
+    # Markdown format
+    if data.get("success"):
+        return f"```\n{data['output'].strip()}\n```" if data.get("output") else ""
+    return f"**Error:**\n```\n{data.get('error', 'Unknown error')}\n```"
+
+
+@functools.lru_cache(maxsize=64)
+def _parse_backtrace(output: str) -> tuple[Frame, ...]:
+    """Parse LLDB backtrace output into structured frames.
+
+    Memoized: the same output is often parsed again, e.g. for a core file
+    whose backtrace result is served from _cached_backtrace.
+    """
+    if "frame #" not in output:
+        return ()
+    return tuple(
+        Frame(
+            int(match.group(1)),
+            match.group(2),
+            match.group(3).strip() if match.group(3) else None,
+            match.group(4).strip() if match.group(4) else None,
+            int(match.group(5)) if match.group(5) else None,
+            match.group(6) or None,
+            int(match.group(7)) if match.group(7) else None,
+        )
+        for match in _FRAME_PATTERN.finditer(output)
+    )
+
+
+@functools.lru_cache(maxsize=64)
+def _backtrace_json(success: bool, output: str, frames: tuple[Frame, ...]) -> str:
+    """Serialize a backtrace response, memoized alongside the parsed frames."""
+    return _dumps(
+        {
+            "success": success,
+            "frames": [frame._asdict() for frame in frames],
+            "raw_output": output,
+        }
+    )
+
+
+# Python `re` errors that LLVM's POSIX-style regex engine (used by
+# `image lookup --regex`) reports for the same pattern. Anything else, e.g. an
+# escape Python doesn't know, may still be valid for LLDB and is left to it.
+_SHARED_REGEX_ERRORS = (
+    "missing ), unterminated subpattern",
+    "unbalanced parenthesis",
+    "unterminated character set",
+    "nothing to repeat",
+    "bad character range",
+)
+
+
+@functools.lru_cache(maxsize=256)
+def _regex_error(pattern: str) -> str | None:
+    """Return why a symbol regex is malformed for LLDB too, or None to let LLDB decide.
+
+    LLDB does the matching itself, so this only screens out patterns both
+    engines reject before paying for an LLDB run that would just report the error.
+    """
+    try:
+        re.compile(pattern)
+    except re.error as e:
+        if e.msg.startswith(_SHARED_REGEX_ERRORS):
+            return str(e)
+    return None
+
+
+def _variable_commands(variables: list[str] | None) -> list[str]:
+    """`frame variable` commands for the named variables, or all locals."""
+    if variables:
+        return [f"frame variable {var}" for var in variables]
+    return ["frame variable"]
+
+
+def _register_commands(register_set: str, specific_registers: list[str] | None = None) -> list[str]:
+    """The `register read` commands for a register set or explicit register names.
+
+    'all' reads every set between marker lines, so an oversized dump can be
+    trimmed by _cap_register_output without counting the rest of the output.
+    """
+    if specific_registers:
+        return [f"register read {' '.join(specific_registers)}"]
+    if register_set == "all":
+        return [
+            f'script print("{_REGISTERS_BEGIN}")',
+            "register read --all",
+            f'script print("{_REGISTERS_END}")',
+        ]
+    if register_set == "float":
+        return ["register read --set 1"]  # Usually FPU
+    if register_set == "vector":
+        return [_VECTOR_REGISTERS]
+    return ["register read"]
+
 
-    model_config = ConfigDict(str_strip_whitespace=True)
+def _cap_register_output(output: str) -> str:
+    """Trim an 'all' register dump to the budget and strip its marker lines.
 
-    executable: str = Field(..., description="Path to the executable", min_length=1)
-    file: str | None = Field(
-        default=None, description="Source file to list (if None, lists around current location)"
+    Only the text between the markers is measured. The general and float sets
+    are always kept; later sets (AVX-512 state alone runs to kilobytes) are
+    kept in order while they fit and named in a note otherwise.
+    """
+    lines = output.split("\n")
+    begin = next((i for i, line in enumerate(lines) if line.strip() == _REGISTERS_BEGIN), None)
+    end = next((i for i, line in enumerate(lines) if line.strip() == _REGISTERS_END), None)
+    if begin is None or end is None or end < begin:
+        return output
+    # Drop the marker lines and, on backends that echo commands, their echo
+    head, body_lines, tail = (
+        [line for line in part if _REGISTERS_BEGIN not in line and _REGISTERS_END not in line]
+        for part in (lines[:begin], lines[begin + 1 : end], lines[end + 1 :])
     )
-    line: int | None = Field(default=None, description="Line number to center on", ge=1)
-    count: int = Field(default=20, description="Number of lines to show", ge=1, le=500)
-    function: str | None = Field(default=None, description="Show source for a specific function")
+    body = "\n".join(body_lines)
+
+    if len(body) > _REGISTER_BUDGET:
+        starts = [m.start() for m in _REGISTER_SET_RE.finditer(body)]
+        sections = [body[: starts[0]]] if starts else [body]
+        sections += [body[a:b] for a, b in zip(starts, [*starts[1:], len(body)])]
+        kept, omitted, size = [], [], 0
+        for index, section in enumerate(sections):
+            if index <= 2 or size + len(section) <= _REGISTER_BUDGET:
+                kept.append(section)
+                size += len(section)
+            else:
+                omitted.append(section.split(":", 1)[0].strip())
+        if omitted:
+            note = (
+                f"[register sets omitted to stay under {_REGISTER_BUDGET // 1024} KB: "
+                f"{', '.join(omitted)}; use register_set='vector' or specific_registers "
+                "to read them]"
+            )
+            body = "".join(kept).rstrip("\n") + "\n" + note
+    return "\n".join([*head, body, *tail])
 
 
-class SymbolLookupInput(BaseModel):
-    """Input for looking up symbols."""
+def _breakpoint_command(location: str) -> str:
+    """The `breakpoint set` command for an address, file:line or function name."""
+    loc = _LOC_RE.fullmatch(location)
+    if loc is None or loc["hex_end"]:
+        return f"breakpoint set --name {shlex.quote(location)}"
+    if loc["hex"]:
+        return f"breakpoint set --address {loc['hex']}"
+    return f"breakpoint set --file {shlex.quote(loc['file'])} --line {loc['line']}"
 
-    model_config = ConfigDict(str_strip_whitespace=True)
 
-    executable: str = Field(..., description="Path to the executable", min_length=1)
-    query: str = Field(..., description="Symbol name or pattern to search for", min_length=1)
-    query_type: str = Field(
-        default="name",
-        description="Type of lookup: 'name' (exact), 'regex' (pattern), 'address' (hex address), 'type' (type name)",
-    )
+def _core_target_command(executable: str, core_file: str) -> str:
+    """The `target create` command loading a core dump together with its executable."""
+    return f"target create {shlex.quote(executable)} --core {shlex.quote(core_file)}"
 
 
-class RegistersInput(BaseModel):
-    """Input for viewing registers."""
+def _run_command(args: Sequence[str] | None) -> str:
+    """The `run` command for a program argument vector, each argument quoted."""
+    return f"run {shlex.join(args)}" if args else "run"
 
-    model_config = ConfigDict(str_strip_whitespace=True)
 
-    executable: str = Field(..., description="Path to the executable", min_length=1)
-    breakpoint: str = Field(..., description="Breakpoint location to stop at", min_length=1)
-    register_set: str = Field(
-        default="general",
-        description="Register set to display: 'general', 'float', 'vector', 'all'",
-    )
-    specific_registers: list[str] | None = Field(
-        default=None, description="Specific register names to show (e.g., ['rax', 'rbx', 'rsp'])"
-    )
-    args: list[str] | None = Field(
-        default=None, description="Command-line arguments to pass to the program"
-    )
+def _build_inspect_script(
+    breakpoint: str, args: list[str] | None, inspections: list[str]
+) -> list[str]:
+    """Build one script that runs to a breakpoint, inspects the stop, then quits.
 
+    Everything a caller wants to know about the stop shares a single launch.
+    """
+    return [
+        _breakpoint_command(breakpoint),
+        _run_command(args),
+        *inspections,
+        "quit",
+    ]
 
-class WatchpointInput(BaseModel):
-    """Input for setting watchpoints."""
 
-    model_config = ConfigDict(str_strip_whitespace=True)
+def _build_debug_script(inp: RunProgramInput) -> list[str]:
+    """Build the single LLDB script that sets up, runs and inspects a program.
 
-    executable: str = Field(..., description="Path to the executable", min_length=1)
-    variable: str = Field(..., description="Variable name or memory address to watch", min_length=1)
-    watch_type: str = Field(
-        default="write", description="Type of access to watch: 'write', 'read', 'read_write'"
-    )
-    condition: str | None = Field(
-        default=None, description="Conditional expression for the watchpoint"
-    )
+    Environment, breakpoints, the launch and the post-stop queries all go into
+    one command list so the whole run costs a single LLDB invocation. The
+    executable itself is loaded by passing it as the script's target.
+    """
+    commands = []
+    if inp.environment:
+        # One setting for all of them: each `settings set` replaces the whole dictionary
+        pairs = (shlex.quote(f"{key}={value}") for key, value in inp.environment.items())
+        commands.append(f"settings set target.env-vars {' '.join(pairs)}")
+
+    if inp.breakpoints:
+        commands.extend(_breakpoint_command(bp) for bp in inp.breakpoints)
+    elif inp.stop_at_entry:
+        commands.append("breakpoint set --name main")
 
+    commands.extend([_run_command(inp.args), "thread backtrace", "frame variable", "quit"])
+    return commands
 
-class RunProgramInput(BaseModel):
-    """Input for running a program with debugging."""
 
-    model_config = ConfigDict(str_strip_whitespace=True)
+# =============================================================================
+# Result Caches
+# =============================================================================
 
-    executable: str = Field(..., description="Path to the executable to run", min_length=1)
-    args: list[str] | None = Field(
-        default=None, description="Command-line arguments to pass to the program"
-    )
-    breakpoints: list[str] | None = Field(
-        default=None, description="List of breakpoint locations to set before running"
-    )
-    environment: dict[str, str] | None = Field(
-        default=None, description="Environment variables to set"
-    )
-    stop_at_entry: bool = Field(default=True, description="Stop at the entry point (main function)")
-    working_dir: str | None = Field(default=None, description="Working directory for the program")
+# Hit/miss counters across the memoized LLDB lookups below
+_CACHE_STATS: dict[str, int] = {"hits": 0, "misses": 0}
 
 
-class AttachProcessInput(BaseModel):
-    """Input for attaching to a running process."""
+class _UncacheableError(Exception):
+    """Raised from a memoized lookup so a failed LLDB run is not cached."""
 
-    model_config = ConfigDict(str_strip_whitespace=True)
+    def __init__(self, result: dict[str, Any]):
+        super().__init__(result.get("error"))
+        self.result = result
 
-    pid: int | None = Field(default=None, description="Process ID to attach to", ge=1)
-    name: str | None = Field(default=None, description="Process name to attach to")
-    wait_for: bool = Field(
-        default=False, description="Wait for the process to launch if using name"
-    )
 
-    @field_validator("name")
-    @classmethod
-    def validate_pid_or_name(cls, v: str | None, info: ValidationInfo) -> str | None:
-        if v is None and info.data.get("pid") is None:
-            raise ValueError("Either 'pid' or 'name' must be provided")
-        return v
+def _canonical_path(path: str, working_dir: str | None = None) -> str:
+    """Resolve relative paths and symlinks so equivalent spellings share cache keys."""
+    return os.path.realpath(os.path.join(working_dir or "", path))
 
 
-class ThreadsInput(BaseModel):
-    """Input for examining threads."""
+def _file_version(path: str | None) -> _FileVersion | None:
+    """Identify a file's current contents by device, inode, mtime and size, or None.
 
-    model_config = ConfigDict(str_strip_whitespace=True)
+    The inode catches atomic replacements within mtime granularity, and the
+    size catches rebuilds that preserve mtime (cp -p, some build caches).
+    """
+    if not path:
+        return None
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return (st.st_dev, st.st_ino, st.st_mtime_ns, st.st_size)
 
-    executable: str = Field(..., description="Path to the executable", min_length=1)
-    breakpoint: str | None = Field(default=None, description="Breakpoint location to stop at")
-    core_file: str | None = Field(default=None, description="Path to core dump file")
-    show_backtrace: bool = Field(default=False, description="Show backtrace for each thread")
 
+class _AsyncLRUCache(Generic[_T]):
+    """functools.lru_cache for coroutine functions: caches awaited results, not coroutines.
 
-class ImageListInput(BaseModel):
-    """Input for listing loaded images/modules."""
+    Hits and misses are counted into _CACHE_STATS. Concurrent calls with the
+    same arguments share one in-flight run. Exceptions propagate and are not
+    cached.
+    """
 
-    model_config = ConfigDict(str_strip_whitespace=True)
+    def __init__(self, fn: Callable[..., Awaitable[_T]], maxsize: int):
+        functools.update_wrapper(self, fn)
+        self._fn = fn
+        self._maxsize = maxsize
+        self._results: collections.OrderedDict[tuple[Any, ...], _T] = collections.OrderedDict()
+        self._pending: dict[tuple[Any, ...], asyncio.Future[_T]] = {}
+
+    async def __call__(self, *key: Any) -> _T:
+        if key in self._results:
+            self._results.move_to_end(key)
+            _CACHE_STATS["hits"] += 1
+            return self._results[key]
+        pending = self._pending.get(key)
+        if pending is not None:
+            _CACHE_STATS["hits"] += 1
+            return await asyncio.shield(pending)
+
+        _CACHE_STATS["misses"] += 1
+        task = asyncio.ensure_future(self._fn(*key))
+        self._pending[key] = task
+        try:
+            value = await asyncio.shield(task)
+        finally:
+            if self._pending.get(key) is task:
+                del self._pending[key]
+        self._results[key] = value
+        if len(self._results) > self._maxsize:
+            self._results.popitem(last=False)
+        return value
+
+    def cache_clear(self) -> None:
+        self._results.clear()
+        self._pending.clear()
+
+
+def _async_lru_cache(
+    maxsize: int,
+) -> Callable[[Callable[..., Awaitable[_T]]], _AsyncLRUCache[_T]]:
+    """Decorator form of _AsyncLRUCache."""
+    return lambda fn: _AsyncLRUCache(fn, maxsize)
+
+
+@_async_lru_cache(maxsize=512)
+async def _cached_backtrace(
+    exec_path: str,
+    exec_version: _FileVersion,
+    core_version: _FileVersion | None,
+    commands: tuple[str, ...],
+    target: str | None,
+) -> dict[str, Any]:
+    """Run a backtrace script, memoized per executable build."""
+    result = await _run_lldb_script(list(commands), target=target)
+    if not result["success"]:
+        raise _UncacheableError(result)
+    return result
 
-    executable: str = Field(..., description="Path to the executable", min_length=1)
-    filter_pattern: str | None = Field(default=None, description="Filter images by name pattern")
 
+@_async_lru_cache(maxsize=256)
+async def _cached_readonly_script(
+    exec_path: str, exec_version: _FileVersion, commands: tuple[str, ...]
+) -> dict[str, Any]:
+    """Run a read-only script against an executable, memoized per executable build."""
+    result = await _run_lldb_script(list(commands), target=exec_path)
+    if not result["success"]:
+        raise _UncacheableError(result)
+    return result
 
-# =============================================================================
-# Helper Functions
-# =============================================================================
 
+async def _run_readonly_script(commands: list[str], executable: str) -> dict[str, Any]:
+    """Run a script that only inspects an executable, reusing earlier results.
 
-def _format_output(data: dict[str, Any], format_type: ResponseFormat) -> str:
-    """Format output based on requested format."""
-    if format_type == ResponseFormat.JSON:
-        return json.dumps(data, indent=2)
+    For tools whose output depends only on their input and the executable
+    on disk (disassembly, symbols, source, images).
+    """
+    exec_path = _canonical_path(executable)
+    exec_version = _file_version(exec_path)
+    if exec_version is None:
+        return await _run_lldb_script(commands, target=executable)
+    try:
+        return await _cached_readonly_script(exec_path, exec_version, tuple(commands))
+    except _UncacheableError as e:
+        return e.result
+
+
+# Commands whose output depends only on the LLDB binary, answered from
+# _STATIC_CACHE (and its on-disk copy) instead of launching LLDB again
+_STATIC_CMDS = ("help", "version", "apropos", "settings list")
+_STATIC_CACHE: dict[tuple[str, bool], dict[str, Any]] = {}
+# The cache file _STATIC_CACHE currently mirrors
+_static_cache_source: Path | None = None
+# Init files LLDB sources at startup; aliases, plugins and settings they add
+# show up in help and settings output
+_LLDBINIT_FILES = tuple(os.path.expanduser(name) for name in ("~/.lldbinit", "~/.lldbinit-lldb"))
+
+# Queries agents commonly open a session with, answered ahead of time
+_PREWARM_STATIC = (
+    "version",
+    "help",
+    *(
+        f"help {topic}"
+        for topic in (
+            "breakpoint",
+            "watchpoint",
+            "run",
+            "process",
+            "thread",
+            "frame",
+            "expression",
+            "memory",
+            "register",
+            "disassemble",
+            "image",
+            "target",
+            "source",
+            "settings",
+            "type",
+            "platform",
+        )
+    ),
+)
 
-    # Markdown format
-    lines = []
 
-    if data.get("success"):
-        if data.get("output"):
-            lines.append("```")
-            lines.append(data["output"].strip())
-            lines.append("```")
-    else:
-        lines.append("**Error:**")
-        lines.append(f"```\n{data.get('error', 'Unknown error')}\n```")
+def _is_static_command(command: str) -> bool:
+    """Whether a command is a metadata query whose output never changes."""
+    command = command.strip()
+    return any(command == name or command.startswith(f"{name} ") for name in _STATIC_CMDS)
 
-    return "\n".join(lines)
 
+@functools.lru_cache(maxsize=1)
+def _lldb_binary_digest() -> str | None:
+    """Hash the LLDB binary once per process; None if it can't be read."""
+    digest = hashlib.sha256()
+    try:
+        with open(shutil.which(LLDB_EXECUTABLE) or LLDB_EXECUTABLE, "rb") as f:
+            for chunk in iter(lambda: f.read(1 << 20), b""):
+                digest.update(chunk)
+    except OSError:
+        return None
+    return digest.hexdigest()
+
+
+def _lldbinit_fingerprint() -> str:
+    """Summarize the modification times of the LLDB init files that exist."""
+    stamps = []
+    for name in _LLDBINIT_FILES:
+        try:
+            stamps.append(f"{name}:{os.stat(name).st_mtime_ns}")
+        except OSError:
+            pass
+    return hashlib.blake2b("\n".join(stamps).encode(), digest_size=8).hexdigest()
+
+
+def _static_cache_path() -> Path | None:
+    """Return the on-disk static cache file for the LLDB binary and its init files."""
+    digest = _lldb_binary_digest()
+    if digest is None:
+        return None
+    return _LLDB_PATH_CACHE.parent / f"static_{digest}_{_lldbinit_fingerprint()}.json"
+
+
+def _load_static_cache() -> None:
+    """Point the in-memory static cache at the current cache file, loading it once.
+
+    Editing an init file selects a different file, so results produced under
+    the old settings are dropped rather than served.
+    """
+    global _static_cache_source
+    path = _static_cache_path()
+    if path is None or path == _static_cache_source:
+        return
+    _static_cache_source = path
+    _STATIC_CACHE.clear()
+    try:
+        for command, fast_mode, result in json.loads(path.read_text()):
+            _STATIC_CACHE.setdefault((command, fast_mode), result)
+    except (OSError, ValueError, TypeError):
+        pass
 
-def _parse_backtrace(output: str) -> list[dict[str, Any]]:
-    """Parse LLDB backtrace output into structured data."""
-    frames = []
-    frame_pattern = re.compile(
-        r"frame #(\d+): (0x[0-9a-fA-F]+) (.+?)(?:`(.+?))?(?:\s+\+\s+(\d+))?(?:\s+at\s+(.+):(\d+))?"
-    )
 
-    for line in output.split("\n"):
-        match = frame_pattern.search(line)
-        if match:
-            frames.append(
-                {
-                    "frame_number": int(match.group(1)),
-                    "address": match.group(2),
-                    "module": match.group(3).strip() if match.group(3) else None,
-                    "function": match.group(4).strip() if match.group(4) else None,
-                    "offset": int(match.group(5)) if match.group(5) else None,
-                    "file": match.group(6) if match.group(6) else None,
-                    "line": int(match.group(7)) if match.group(7) else None,
-                }
-            )
+def _static_lookup(key: tuple[str, bool]) -> dict[str, Any] | None:
+    """Return a cached static command result, loading the disk cache on first use."""
+    _load_static_cache()
+    result = _STATIC_CACHE.get(key)
+    _CACHE_STATS["hits" if result is not None else "misses"] += 1
+    return result
+
+
+def _static_store(key: tuple[str, bool], result: dict[str, Any]) -> None:
+    """Remember a static command result in memory and on disk."""
+    _STATIC_CACHE[key] = result
+    _static_save()
+
+
+def _static_save() -> None:
+    """Write the in-memory static cache to disk."""
+    path = _static_cache_path()
+    if path is None:
+        return
+    entries = [[command, fast_mode, value] for (command, fast_mode), value in _STATIC_CACHE.items()]
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_suffix(f".{os.getpid()}.tmp")
+        tmp.write_text(json.dumps(entries))
+        os.replace(tmp, path)
+    except OSError:
+        pass
+
 
-    return frames
+async def _prewarm_static_cache() -> None:
+    """Fetch uncached _PREWARM_STATIC results with a single LLDB run.
+
+    The combined output is split on LLDB's echo of each command; anything
+    that can't be attributed to its command is left for an on-demand run.
+    """
+    await asyncio.to_thread(_load_static_cache)
+    missing = [command for command in _PREWARM_STATIC if (command, True) not in _STATIC_CACHE]
+    if not missing:
+        return
+    result = await _run_lldb_script(missing, timeout=120, drop_stderr=True)
+    if not result["success"]:
+        return
+    output = result["output"]
+
+    starts: list[int] = []
+    for command in missing:
+        start = output.find(f"(lldb) {command}\n", starts[-1] + 1 if starts else 0)
+        if start < 0:
+            break
+        starts.append(start)
+    starts.append(len(output))
+    for command, start, end in zip(missing, starts, starts[1:]):
+        _STATIC_CACHE.setdefault(
+            (command, True),
+            {
+                "success": True,
+                "output": output[start:end].rstrip(),
+                "error": None,
+                "return_code": 0,
+            },
+        )
+    if len(starts) > 1:
+        _static_save()
 
 
 # =============================================================================
@@ -519,7 +2378,10 @@ async def lldb_run_command(params: RunCommandInput) -> str:
     Returns:
         str: Command output or error message
     """
-    result = _run_lldb_command(params.command, target=params.target, working_dir=params.working_dir)
+    # Arbitrary commands get stock LLDB behavior rather than the fast-mode prelude
+    result = await _run_lldb_command(
+        params.command, target=params.target, working_dir=params.working_dir, fast_mode=False
+    )
 
     if result["success"]:
         return f"```\n{result['output']}\n```"
@@ -554,44 +2416,42 @@ async def lldb_analyze_crash(params: AnalyzeCrashInput) -> str:
     """
     commands = []
 
+    # A core file is loaded together with its executable by one `target create`
+    target = None if params.core_file else params.executable
     if params.core_file:
-        commands.append(f"target create {params.executable} --core {params.core_file}")
-    else:
-        commands.append(f"target create {params.executable}")
+        commands.append(_core_target_command(params.executable, params.core_file))
 
     commands.extend(["bt all", "register read", "frame variable", "image list"])
 
-    result = _run_lldb_script(commands, working_dir=params.working_dir)
+    if LLDB_BACKEND == "sbapi" and params.core_file:
+        _prewarm_target(params.executable, params.working_dir)
+        result = await _sb_call(
+            functools.partial(
+                _sb_crash_report, params.executable, params.core_file, params.working_dir
+            ),
+            timeout=60,
+        )
+    else:
+        result = await _run_lldb_script(commands, target=target, working_dir=params.working_dir)
 
     if params.response_format == ResponseFormat.JSON:
-        return json.dumps(
+        return _dumps(
             {
                 "success": result["success"],
                 "executable": params.executable,
                 "core_file": params.core_file,
                 "output": result["output"],
                 "error": result.get("error"),
-            },
-            indent=2,
+            }
         )
 
-    # Markdown format
-    lines = [f"# Crash Analysis: {Path(params.executable).name}", ""]
-
-    if params.core_file:
-        lines.append(f"**Core file:** {params.core_file}")
-        lines.append("")
-
+    # Markdown format, assembled in one pass over the (possibly large) output
+    core = f"**Core file:** {params.core_file}\n\n" if params.core_file else ""
     if result["success"]:
-        lines.append("## Analysis Output")
-        lines.append("```")
-        lines.append(result["output"].strip())
-        lines.append("```")
+        body = f"## Analysis Output\n```\n{result['output']}\n```"
     else:
-        lines.append("## Error")
-        lines.append(f"```\n{result.get('error', 'Unknown error')}\n```")
-
-    return "\n".join(lines)
+        body = f"## Error\n```\n{result.get('error', 'Unknown error')}\n```"
+    return _TMPL_CRASH.format(name=Path(params.executable).name, core=core, body=body)
 
 
 @mcp.tool(
@@ -619,27 +2479,36 @@ async def lldb_set_breakpoint(params: SetBreakpointInput) -> str:
     Returns:
         str: Confirmation of breakpoint creation with details
     """
-    commands = [f"target create {params.executable}"]
-
-    # Determine breakpoint type from location format
-    if ":" in params.location and not params.location.startswith("0x"):
-        # File:line format
-        parts = params.location.rsplit(":", 1)
-        bp_cmd = f"breakpoint set --file {parts[0]} --line {parts[1]}"
-    elif params.location.startswith("0x"):
-        # Address
-        bp_cmd = f"breakpoint set --address {params.location}"
-    else:
-        # Function name
-        bp_cmd = f"breakpoint set --name {params.location}"
+    commands: list[str] = []
+
+    bp_cmd = _breakpoint_command(params.location)
 
     if params.condition:
-        bp_cmd += f" --condition '{params.condition}'"
+        bp_cmd += f" --condition {shlex.quote(params.condition)}"
 
     commands.append(bp_cmd)
     commands.append("breakpoint list")
 
-    result = _run_lldb_script(commands, working_dir=params.working_dir)
+    if params.session_id:
+        result = await _run_in_session(
+            params.session_id, commands, params.executable, params.working_dir
+        )
+    elif LLDB_BACKEND == "sbapi":
+        _prewarm_target(params.executable, params.working_dir)
+        result = await _sb_call(
+            functools.partial(
+                _sb_set_breakpoint,
+                params.executable,
+                params.working_dir,
+                params.location,
+                params.condition,
+            ),
+            timeout=60,
+        )
+    else:
+        result = await _run_lldb_script(
+            commands, target=params.executable, working_dir=params.working_dir
+        )
 
     if result["success"]:
         return f"**Breakpoint set successfully**\n\n```\n{result['output']}\n```"
@@ -671,42 +2540,90 @@ async def lldb_examine_variables(params: ExamineVariablesInput) -> str:
     Returns:
         str: Variable values at the breakpoint
     """
-    commands = [
-        f"target create {params.executable}",
-        f"breakpoint set --name {params.breakpoint}",
-        "run" + (" " + " ".join(params.args) if params.args else ""),
-    ]
+    result = await _run_stopped(
+        params.executable,
+        params.breakpoint,
+        params.args,
+        _variable_commands(params.variables),
+        core_file=params.core_file,
+    )
 
-    if params.variables:
-        for var in params.variables:
-            commands.append(f"frame variable {var}")
-    else:
-        commands.append("frame variable")
+    if params.response_format == ResponseFormat.JSON:
+        return _dumps(
+            {
+                "success": result["success"],
+                "breakpoint": params.breakpoint,
+                "core_file": params.core_file,
+                "output": result["output"],
+                "error": result.get("error"),
+            }
+        )
+
+    body = result["output"].strip() if result["success"] else result.get("error", "Unknown error")
+    return _TMPL_VARIABLES.format(stop=params.breakpoint or params.core_file, body=body)
+
+
+@mcp.tool(
+    name="lldb_inspect",
+    annotations=ToolAnnotations(
+        title="Inspect Program State",
+        readOnlyHint=True,
+        destructiveHint=False,
+        idempotentHint=True,
+        openWorldHint=False,
+    ),
+)
+async def lldb_inspect(params: InspectInput) -> str:
+    """Collect several views of program state at a breakpoint in one run.
+
+    Runs the program once until the breakpoint, then gathers everything
+    requested in `include`:
+    - 'bt': Backtrace of the stopped thread
+    - 'vars': Local variables and arguments
+    - 'regs': CPU registers
+    - 'disasm': Disassembly of the current function
+    - 'memory': Memory at memory_address
 
-    commands.append("quit")
+    Prefer this over separate lldb_backtrace/lldb_examine_variables/
+    lldb_registers calls, which each relaunch the program.
 
-    result = _run_lldb_script(commands)
+    Args:
+        params: InspectInput with executable, breakpoint and what to include
+
+    Returns:
+        str: The requested views, in the order given
+    """
+    inspections = {
+        "bt": ["thread backtrace"],
+        "vars": _variable_commands(params.variables),
+        "regs": _register_commands(params.register_set),
+        "disasm": ["disassemble --frame"],
+        "memory": [f"memory read --format x --count {params.memory_count} {params.memory_address}"],
+    }
+    result = await _run_stopped(
+        params.executable,
+        params.breakpoint,
+        params.args,
+        [command for part in dict.fromkeys(params.include) for command in inspections[part]],
+    )
+    output = result["output"]
+    if "regs" in params.include and params.register_set == "all":
+        output = _cap_register_output(output)
 
     if params.response_format == ResponseFormat.JSON:
-        return json.dumps(
+        return _dumps(
             {
                 "success": result["success"],
                 "breakpoint": params.breakpoint,
-                "output": result["output"],
+                "include": list(dict.fromkeys(params.include)),
+                "output": output,
                 "error": result.get("error"),
-            },
-            indent=2,
+            }
         )
 
-    lines = [
-        f"## Variables at `{params.breakpoint}`",
-        "",
-        "```",
-        result["output"].strip() if result["success"] else result.get("error", "Unknown error"),
-        "```",
-    ]
-
-    return "\n".join(lines)
+    if not result["success"]:
+        return _format_output(result, ResponseFormat.MARKDOWN)
+    return _TMPL_INSPECT.format(breakpoint=params.breakpoint, body=output.strip())
 
 
 @mcp.tool(
@@ -737,17 +2654,33 @@ async def lldb_disassemble(params: DisassembleInput) -> str:
     Returns:
         str: Assembly listing
     """
-    commands = [f"target create {params.executable}"]
+    is_json = params.response_format == ResponseFormat.JSON
+    if is_json and LLDB_BACKEND == "sbapi" and params.target.lower() != "current":
+        # Decode instructions directly instead of formatting and re-parsing text
+        _prewarm_target(params.executable)
+        result = await _sb_call(
+            functools.partial(_sb_read_instructions, params.executable, params.target), 60
+        )
+        return _dumps(
+            {
+                "success": result["success"],
+                "target": params.target,
+                "instructions": result.get("instructions", []),
+                "error": result.get("error"),
+            }
+        )
+
+    commands: list[str] = []
 
     dis_cmd = "disassemble"
 
-    if "-" in params.target and params.target.startswith("0x"):
+    loc = _LOC_RE.fullmatch(params.target)
+    if loc and loc["hex_end"]:
         # Address range
-        parts = params.target.split("-")
-        dis_cmd += f" --start-address {parts[0]} --end-address {parts[1]}"
-    elif params.target.startswith("0x"):
+        dis_cmd += f" --start-address {loc['hex']} --end-address {loc['hex_end']}"
+    elif loc and loc["hex"]:
         # Single address
-        dis_cmd += f" --start-address {params.target} --count 50"
+        dis_cmd += f" --start-address {loc['hex']} --count 50"
     elif params.target.lower() == "current":
         dis_cmd += " --frame"
     else:
@@ -761,9 +2694,19 @@ async def lldb_disassemble(params: DisassembleInput) -> str:
 
     commands.append(dis_cmd)
 
-    result = _run_lldb_script(commands)
+    result = await _run_readonly_script(commands, params.executable)
 
-    return f"## Disassembly: `{params.target}`\n\n```asm\n{result['output'].strip()}\n```"
+    if is_json:
+        return _dumps(
+            {
+                "success": result["success"],
+                "target": params.target,
+                "output": result["output"],
+                "error": result.get("error"),
+            }
+        )
+
+    return _TMPL_DISASM.format(target=params.target, body=result["output"].strip())
 
 
 @mcp.tool(
@@ -792,25 +2735,52 @@ async def lldb_read_memory(params: ReadMemoryInput) -> str:
     Returns:
         str: Memory contents in requested format
     """
-    commands = [f"target create {params.executable}"]
-
-    if params.breakpoint:
-        commands.extend(
-            [
-                f"breakpoint set --name {params.breakpoint}",
-                "run",
-            ]
+    is_json = params.response_format == ResponseFormat.JSON
+    address = _LOC_RE.fullmatch(params.address)
+    static = not (params.breakpoint or params.core_file)
+    if is_json and LLDB_BACKEND == "sbapi" and static and address and not address["hex_end"]:
+        # Raw bytes straight from the executable, skipping LLDB's formatter
+        _prewarm_target(params.executable)
+        result = await _sb_call(
+            functools.partial(
+                _sb_read_memory, params.executable, int(address["hex"], 16), params.count
+            ),
+            60,
+        )
+        return _dumps(
+            {
+                "success": result["success"],
+                "address": params.address,
+                "bytes": result.get("bytes"),
+                "error": result.get("error"),
+            }
         )
 
     mem_cmd = f"memory read --format {params.format} --count {params.count} {params.address}"
-    commands.append(mem_cmd)
 
-    if params.breakpoint:
-        commands.append("quit")
+    if not static:
+        result = await _run_stopped(
+            params.executable,
+            params.breakpoint,
+            None,
+            [mem_cmd],
+            core_file=params.core_file,
+            drop_stderr=True,
+        )
+    else:
+        result = await _run_lldb_script([mem_cmd], target=params.executable, drop_stderr=True)
 
-    result = _run_lldb_script(commands)
+    if is_json:
+        return _dumps(
+            {
+                "success": result["success"],
+                "address": params.address,
+                "output": result["output"],
+                "error": result.get("error"),
+            }
+        )
 
-    return f"## Memory at `{params.address}`\n\n```\n{result['output'].strip()}\n```"
+    return _TMPL_MEMORY.format(address=params.address, body=result["output"].strip())
 
 
 @mcp.tool(
@@ -840,17 +2810,15 @@ async def lldb_evaluate(params: EvaluateExpressionInput) -> str:
     Returns:
         str: Expression result with type information
     """
-    commands = [
-        f"target create {params.executable}",
-        f"breakpoint set --name {params.breakpoint}",
-        "run" + (" " + " ".join(params.args) if params.args else ""),
-        f"expression {params.expression}",
-        "quit",
-    ]
-
-    result = _run_lldb_script(commands)
+    result = await _run_stopped(
+        params.executable,
+        params.breakpoint,
+        params.args,
+        [f"expression {params.expression}"],
+        core_file=params.core_file,
+    )
 
-    return f"## Expression: `{params.expression}`\n\n```\n{result['output'].strip()}\n```"
+    return _TMPL_EXPRESSION.format(expression=params.expression, body=result["output"].strip())
 
 
 @mcp.tool(
@@ -878,15 +2846,18 @@ async def lldb_backtrace(params: BacktraceInput) -> str:
     Returns:
         str: Stack backtrace with frame information
     """
+    # Canonical paths in the script too, so every spelling of a file shares a cache entry
+    exec_path = _canonical_path(params.executable)
+    core_path = _canonical_path(params.core_file) if params.core_file else None
     commands = []
 
-    if params.core_file:
-        commands.append(f"target create {params.executable} --core {params.core_file}")
-    else:
-        commands.append(f"target create {params.executable}")
-        if params.breakpoint:
-            commands.append(f"breakpoint set --name {params.breakpoint}")
-            commands.append("run" + (" " + " ".join(params.args) if params.args else ""))
+    # A core file is loaded together with its executable by one `target create`
+    target = None if core_path else exec_path
+    if core_path:
+        commands.append(_core_target_command(exec_path, core_path))
+    elif params.breakpoint:
+        commands.append(_breakpoint_command(params.breakpoint))
+        commands.append(_run_command(params.args))
 
     bt_cmd = "thread backtrace"
     if params.all_threads:
@@ -895,21 +2866,31 @@ async def lldb_backtrace(params: BacktraceInput) -> str:
 
     commands.append(bt_cmd)
 
-    if not params.core_file:
+    if not core_path:
         commands.append("quit")
 
-    result = _run_lldb_script(commands)
+    exec_version = _file_version(exec_path)
+    if exec_version is None:
+        result = await _run_lldb_script(commands, target=target)
+    else:
+        try:
+            result = await _cached_backtrace(
+                exec_path,
+                exec_version,
+                _file_version(core_path),
+                tuple(commands),
+                target,
+            )
+        except _UncacheableError as e:
+            result = e.result
 
     if params.response_format == ResponseFormat.JSON:
-        frames = _parse_backtrace(result["output"])
-        return json.dumps(
-            {"success": result["success"], "frames": frames, "raw_output": result["output"]},
-            indent=2,
-        )
-
-    lines = ["## Stack Backtrace", "", "```", result["output"].strip(), "```"]
+        # Frames are only parsed for JSON; markdown shows LLDB's own text
+        frames = result.get("frames")
+        frames = tuple(frames) if frames else _parse_backtrace(result["output"])
+        return _backtrace_json(result["success"], result["output"], frames)
 
-    return "\n".join(lines)
+    return _TMPL_BACKTRACE.format(body=result["output"].strip())
 
 
 @mcp.tool(
@@ -936,7 +2917,7 @@ async def lldb_source(params: ListSourceInput) -> str:
     Returns:
         str: Source code listing with line numbers
     """
-    commands = [f"target create {params.executable}"]
+    commands: list[str] = []
 
     if params.function:
         commands.append(f"source list --name {params.function} --count {params.count}")
@@ -949,10 +2930,10 @@ async def lldb_source(params: ListSourceInput) -> str:
     else:
         commands.append(f"source list --count {params.count}")
 
-    result = _run_lldb_script(commands)
+    result = await _run_readonly_script(commands, params.executable)
 
     title = params.function or params.file or "Source"
-    return f"## {title}\n\n```cpp\n{result['output'].strip()}\n```"
+    return _TMPL_SOURCE.format(title=title, body=result["output"].strip())
 
 
 @mcp.tool(
@@ -980,22 +2961,20 @@ async def lldb_symbols(params: SymbolLookupInput) -> str:
     Returns:
         str: Symbol information including address and source location
     """
-    commands = [f"target create {params.executable}"]
-
-    if params.query_type == "name":
-        commands.append(f"image lookup --name {params.query}")
-    elif params.query_type == "regex":
-        commands.append(f"image lookup --regex --name {params.query}")
-    elif params.query_type == "address":
-        commands.append(f"image lookup --address {params.query}")
-    elif params.query_type == "type":
-        commands.append(f"image lookup --type {params.query}")
-    else:
-        commands.append(f"image lookup --name {params.query}")
+    if params.query_type == "regex":
+        error = _regex_error(params.query)
+        if error is not None:
+            return _format_output(
+                {"success": False, "error": f"Invalid regex '{params.query}': {error}"},
+                ResponseFormat.MARKDOWN,
+            )
 
-    result = _run_lldb_script(commands)
+    flag = _SYMBOL_LOOKUP.get(params.query_type, "--name")
+    commands = [f"image lookup {flag} {shlex.quote(params.query)}"]
 
-    return f"## Symbol Lookup: `{params.query}`\n\n```\n{result['output'].strip()}\n```"
+    result = await _run_readonly_script(commands, params.executable)
+
+    return _TMPL_SYMBOLS.format(query=params.query, body=result["output"].strip())
 
 
 @mcp.tool(
@@ -1023,29 +3002,19 @@ async def lldb_registers(params: RegistersInput) -> str:
     Returns:
         str: Register values in hexadecimal format
     """
-    commands = [
-        f"target create {params.executable}",
-        f"breakpoint set --name {params.breakpoint}",
-        "run" + (" " + " ".join(params.args) if params.args else ""),
-    ]
-
-    if params.specific_registers:
-        reg_cmd = f"register read {' '.join(params.specific_registers)}"
-    elif params.register_set == "all":
-        reg_cmd = "register read --all"
-    elif params.register_set == "float":
-        reg_cmd = "register read --set 1"  # Usually FPU
-    elif params.register_set == "vector":
-        reg_cmd = "register read --set 2"  # Usually SSE/AVX
-    else:
-        reg_cmd = "register read"
-
-    commands.append(reg_cmd)
-    commands.append("quit")
+    result = await _run_stopped(
+        params.executable,
+        params.breakpoint,
+        params.args,
+        _register_commands(params.register_set, params.specific_registers),
+        core_file=params.core_file,
+    )
 
-    result = _run_lldb_script(commands)
+    output = result["output"].strip()
+    if params.register_set == "all" and not params.specific_registers:
+        output = _cap_register_output(output)
 
-    return f"## Registers at `{params.breakpoint}`\n\n```\n{result['output'].strip()}\n```"
+    return _TMPL_REGISTERS.format(stop=params.breakpoint or params.core_file, body=output)
 
 
 @mcp.tool(
@@ -1072,9 +3041,9 @@ async def lldb_watchpoint(params: WatchpointInput) -> str:
     Returns:
         str: Confirmation of watchpoint creation
     """
-    commands = [f"target create {params.executable}"]
+    commands: list[str] = []
 
-    wp_cmd = f"watchpoint set variable {params.variable}"
+    wp_cmd = f"watchpoint set variable {shlex.quote(params.variable)}"
 
     if params.watch_type == "read":
         wp_cmd += " --watch read"
@@ -1085,13 +3054,13 @@ async def lldb_watchpoint(params: WatchpointInput) -> str:
     commands.append(wp_cmd)
 
     if params.condition:
-        commands.append(f"watchpoint modify --condition '{params.condition}'")
+        commands.append(f"watchpoint modify --condition {shlex.quote(params.condition)}")
 
     commands.append("watchpoint list")
 
-    result = _run_lldb_script(commands)
+    result = await _run_lldb_script(commands, target=params.executable)
 
-    return f"## Watchpoint on `{params.variable}`\n\n```\n{result['output'].strip()}\n```"
+    return _TMPL_WATCHPOINT.format(variable=params.variable, body=result["output"].strip())
 
 
 @mcp.tool(
@@ -1119,36 +3088,18 @@ async def lldb_run(params: RunProgramInput) -> str:
     Returns:
         str: Program state after stopping (backtrace, variables)
     """
-    commands = [f"target create {params.executable}"]
-
-    # Set environment variables
-    if params.environment:
-        for key, value in params.environment.items():
-            commands.append(f"settings set target.env-vars {key}={value}")
-
-    # Set breakpoints
-    if params.breakpoints:
-        for bp in params.breakpoints:
-            if ":" in bp and not bp.startswith("0x"):
-                parts = bp.rsplit(":", 1)
-                commands.append(f"breakpoint set --file {parts[0]} --line {parts[1]}")
-            else:
-                commands.append(f"breakpoint set --name {bp}")
-    elif params.stop_at_entry:
-        commands.append("breakpoint set --name main")
-
-    # Prepare run command
-    run_cmd = "run"
-    if params.args:
-        run_cmd += " " + " ".join(params.args)
+    commands = _build_debug_script(params)
 
-    commands.extend([run_cmd, "thread backtrace", "frame variable", "quit"])
-
-    result = _run_lldb_script(commands, working_dir=params.working_dir)
+    if params.session_id:
+        result = await _run_in_session(
+            params.session_id, commands, params.executable, params.working_dir
+        )
+    else:
+        result = await _run_lldb_script(
+            commands, target=params.executable, working_dir=params.working_dir
+        )
 
-    return (
-        f"## Program Run: `{Path(params.executable).name}`\n\n```\n{result['output'].strip()}\n```"
-    )
+    return _TMPL_RUN.format(name=Path(params.executable).name, body=result["output"].strip())
 
 
 @mcp.tool(
@@ -1178,13 +3129,13 @@ async def lldb_threads(params: ThreadsInput) -> str:
     """
     commands = []
 
+    # A core file is loaded together with its executable by one `target create`
+    target = None if params.core_file else params.executable
     if params.core_file:
-        commands.append(f"target create {params.executable} --core {params.core_file}")
-    else:
-        commands.append(f"target create {params.executable}")
-        if params.breakpoint:
-            commands.append(f"breakpoint set --name {params.breakpoint}")
-            commands.append("run")
+        commands.append(_core_target_command(params.executable, params.core_file))
+    elif params.breakpoint:
+        commands.append(_breakpoint_command(params.breakpoint))
+        commands.append("run")
 
     commands.append("thread list")
 
@@ -1194,9 +3145,9 @@ async def lldb_threads(params: ThreadsInput) -> str:
     if not params.core_file:
         commands.append("quit")
 
-    result = _run_lldb_script(commands)
+    result = await _run_lldb_script(commands, target=target)
 
-    return f"## Threads\n\n```\n{result['output'].strip()}\n```"
+    return _TMPL_THREADS.format(body=result["output"].strip())
 
 
 @mcp.tool(
@@ -1224,20 +3175,20 @@ async def lldb_images(params: ImageListInput) -> str:
     Returns:
         str: List of loaded images with addresses
     """
-    commands = [f"target create {params.executable}", "image list"]
+    commands = ["image list"]
 
-    result = _run_lldb_script(commands)
+    result = await _run_readonly_script(commands, params.executable)
 
     output = result["output"]
 
-    # Apply filter if specified
+    # Filter the cached full listing with one case-insensitive scan; LLDB's own
+    # `image list <name>` only matches whole module names
     if params.filter_pattern and result["success"]:
-        filtered_lines = [
-            line for line in output.split("\n") if params.filter_pattern.lower() in line.lower()
-        ]
+        pattern = f"^.*{re.escape(params.filter_pattern)}.*$"
+        filtered_lines = re.findall(pattern, output, re.IGNORECASE | re.MULTILINE)
         output = "\n".join(filtered_lines) if filtered_lines else "No images matching filter"
 
-    return f"## Loaded Images\n\n```\n{output.strip()}\n```"
+    return _TMPL_IMAGES.format(body=output.strip())
 
 
 @mcp.tool(
@@ -1268,9 +3219,9 @@ async def lldb_help(topic: str = "") -> str:
     if topic:
         cmd += f" {topic}"
 
-    result = _run_lldb_command(cmd)
+    result = await _run_lldb_command(cmd)
 
-    return f"## LLDB Help{': ' + topic if topic else ''}\n\n```\n{result['output'].strip()}\n```"
+    return _TMPL_HELP.format(topic=f": {topic}" if topic else "", body=result["output"].strip())
 
 
 @mcp.tool(
@@ -1289,9 +3240,76 @@ async def lldb_version() -> str:
     Returns:
         str: LLDB version and build information
     """
-    result = _run_lldb_command("version")
+    result = await _run_lldb_command("version")
+
+    return _TMPL_VERSION.format(body=result["output"].strip())
+
+
+@mcp.tool(
+    name="lldb_invalidate_cache",
+    annotations=ToolAnnotations(
+        title="Invalidate Result Cache",
+        readOnlyHint=False,
+        destructiveHint=False,
+        idempotentHint=True,
+        openWorldHint=False,
+    ),
+)
+async def lldb_invalidate_cache() -> str:
+    """Clear cached backtrace, symbol, disassembly, source and image results.
+
+    Results are cached per executable build (keyed on its modification time),
+    so clearing is only needed when a program's behavior changes without a
+    rebuild, e.g. because its input files, sources or environment changed.
+
+    Returns:
+        str: Cache statistics accumulated before clearing
+    """
+    _cached_backtrace.cache_clear()
+    _parse_backtrace.cache_clear()
+    _backtrace_json.cache_clear()
+    _cached_readonly_script.cache_clear()
+    hits, misses = _CACHE_STATS["hits"], _CACHE_STATS["misses"]
+    _CACHE_STATS.update(hits=0, misses=0)
 
-    return f"## LLDB Version\n\n```\n{result['output'].strip()}\n```"
+    return f"## Cache Invalidated\n\n```\nhits: {hits}\nmisses: {misses}\n```"
+
+
+@mcp.tool(
+    name="lldb_release_session",
+    annotations=ToolAnnotations(
+        title="Release Paused Program or Session",
+        readOnlyHint=False,
+        destructiveHint=True,
+        idempotentHint=True,
+        openWorldHint=False,
+    ),
+)
+async def lldb_release_session(params: ReleaseSessionInput) -> str:
+    """Kill programs kept stopped at a breakpoint, or close a debug session.
+
+    With session_id, the named session's LLDB process is shut down and its
+    breakpoints are discarded; the other fields are ignored.
+
+    With the sbapi backend, lldb_examine_variables, lldb_inspect,
+    lldb_evaluate, lldb_registers and lldb_read_memory leave the program
+    stopped at its breakpoint so follow-up queries skip the relaunch. Paused
+    programs are released automatically after LLDB_MCP_PAUSED_TTL seconds
+    (default 300); call this to release them sooner, e.g. before rerunning
+    with changed input files.
+
+    Args:
+        params: ReleaseSessionInput optionally narrowing which sessions to release
+
+    Returns:
+        str: Number of paused programs released, or whether the session was closed
+    """
+    if params.session_id:
+        if await asyncio.to_thread(release_session, params.session_id):
+            return f"Closed debug session '{params.session_id}'."
+        return f"No debug session '{params.session_id}'."
+    released = await asyncio.to_thread(_sb_release_paused, params.executable, params.breakpoint)
+    return f"Released {released} paused program{'' if released == 1 else 's'}."
 
 
 # =============================================================================
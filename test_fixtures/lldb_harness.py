@@ -0,0 +1,193 @@
+"""
+Shared LLDB plumbing for the fixture test scripts.
+
+Raw LLDB checks run on the server's persistent LLDB workers rather than a
+fresh `lldb --batch` per check, so LLDB starts (and loads each fixture's
+symbols) once per working directory for the whole test run. LLDB's on-disk
+index cache is enabled for the run too, so symbol tables and DWARF indexes
+built for a fixture by one worker are reused by the others.
+
+build_fixtures() compiles whichever fixture executables are missing before
+a test run starts. LLDB is probed once at import; tests wrapped in
+requires_lldb are skipped without spawning anything when it is missing.
+
+Test reports are written to `out` and emitted by flush(). Each task started
+by gather_tests() gets its own buffer, so tests running concurrently still
+print their reports as whole blocks.
+"""
+
+import asyncio
+import contextvars
+import functools
+import io
+import shutil
+import sys
+import tempfile
+from pathlib import Path
+
+# Add parent dir to path so we can import the server module
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from lldb_mcp_server import LLDB_EXECUTABLE, _run_in_worker
+
+FIXTURES_DIR = Path(__file__).parent
+# The LLDB the server will run (LLDB_MCP_LLDB or PATH), looked up once
+LLDB_PATH = shutil.which(LLDB_EXECUTABLE)
+LLDB_OK = LLDB_PATH is not None
+EXE_SUFFIX = ".exe" if sys.platform == "win32" else ""
+
+# Fixture executables and the sources each one is built from
+FIXTURE_SOURCES = {
+    "simple": ["simple.cpp"],
+    "variables": ["variables.cpp"],
+    "multifile": ["multifile_main.cpp", "multifile_helper.cpp"],
+}
+
+# Per-run index cache, removed when the test run exits
+_INDEX_CACHE = tempfile.TemporaryDirectory(prefix="lldb-index-cache-")
+INDEX_CACHE_COMMANDS = [
+    "settings set symbols.enable-lldb-index-cache true",
+    f'settings set symbols.lldb-index-cache-path "{_INDEX_CACHE.name}"',
+]
+
+# Report buffer for the current test; gather_tests() gives each task its own
+_buffer: contextvars.ContextVar[io.StringIO] = contextvars.ContextVar(
+    "_buffer", default=io.StringIO()
+)
+
+
+class _TestOutput:
+    """Writable stand-in for the current test's report buffer."""
+
+    def write(self, text):
+        return _buffer.get().write(text)
+
+
+out = _TestOutput()
+
+
+def flush():
+    """Write the current test's buffered output to stdout in one go."""
+    buffer = _buffer.get()
+    sys.stdout.write(buffer.getvalue())
+    sys.stdout.flush()
+    buffer.seek(0)
+    buffer.truncate()
+
+
+async def _run_isolated(coro):
+    _buffer.set(io.StringIO())
+    try:
+        return await coro
+    finally:
+        flush()
+
+
+async def gather_tests(specs):
+    """
+    Run (name, coroutine) test specs concurrently.
+
+    Reports appear in completion order, one test at a time. Returns a list of
+    (name, result) pairs in spec order.
+    """
+    outcomes = await asyncio.gather(*(_run_isolated(coro) for _, coro in specs))
+    return list(zip((name for name, _ in specs), outcomes))
+
+
+def requires_lldb(test):
+    """
+    Skip a test coroutine when LLDB is not installed.
+
+    Under pytest the test is reported as skipped; run as a script it returns
+    True so it does not count as a failure.
+    """
+
+    @functools.wraps(test)
+    async def wrapper(*args, **kwargs):
+        if not LLDB_OK:
+            if "pytest" in sys.modules:
+                import pytest
+
+                pytest.skip("LLDB not found")
+            return True
+        return await test(*args, **kwargs)
+
+    return wrapper
+
+
+async def run_lldb(commands, cwd=None, timeout=60):
+    """
+    Run LLDB commands on the long-lived LLDB process for `cwd`.
+
+    The process is reset after every call, so each call still starts from a
+    clean debugger. Returns the server's result dict (success, output, error).
+    """
+    commands = [*INDEX_CACHE_COMMANDS, *commands]
+    return await asyncio.to_thread(_run_in_worker, commands, None, cwd, timeout)
+
+
+async def _compile(exe, sources):
+    """Build one fixture with clang++; returns an error message, or None on success."""
+    try:
+        proc = await asyncio.create_subprocess_exec(
+            "clang++",
+            "-g",
+            "-O0",
+            "-o",
+            str(exe),
+            *(str(FIXTURES_DIR / source) for source in sources),
+            stdout=asyncio.subprocess.DEVNULL,
+            stderr=asyncio.subprocess.PIPE,
+        )
+    except FileNotFoundError:
+        return "clang++ not found in PATH"
+    _, stderr = await proc.communicate()
+    if proc.returncode == 0:
+        return None
+    return stderr.decode(errors="replace").strip() or "clang++ failed"
+
+
+async def build_fixtures():
+    """
+    Compile every missing fixture executable in parallel.
+
+    Returns a dict mapping each fixture that could not be built to the error.
+    """
+    missing = {
+        name: sources
+        for name, sources in FIXTURE_SOURCES.items()
+        if not (FIXTURES_DIR / f"{name}{EXE_SUFFIX}").exists()
+    }
+    errors = await asyncio.gather(
+        *(
+            _compile(FIXTURES_DIR / f"{name}{EXE_SUFFIX}", sources)
+            for name, sources in missing.items()
+        )
+    )
+    return {name: error for name, error in zip(missing, errors) if error}
+
+
+async def run_lldb_batched(command_groups, cwd=None, timeout=60):
+    """
+    Run several independent command groups in a single LLDB call.
+
+    A marker line printed before each group splits the combined output, so
+    the groups share one round-trip to LLDB. Groups that create a target get
+    a fresh one, numbering breakpoints from 1, while symbols already loaded
+    for the executable are reused. Returns one output string per group.
+    """
+    markers = {f"<<<GROUP:{i}>>>": i for i in range(len(command_groups))}
+    commands = []
+    for marker, group in zip(markers, command_groups):
+        commands += [f'script print("{marker}")', *group]
+    result = await run_lldb(commands, cwd=cwd, timeout=timeout)
+
+    outputs = [[] for _ in command_groups]
+    current = None
+    for line in result["output"].splitlines(keepends=True):
+        index = markers.get(line.strip())
+        if index is not None:
+            current = outputs[index]
+        elif current is not None and "<<<GROUP:" not in line:  # skip the marker commands' echo
+            current.append(line)
+    return ["".join(output) for output in outputs]
@@ -5,28 +5,36 @@ Tests breakpoints from various working directories and with different location f
 """
 
 import asyncio
-import json
 import os
-import subprocess
+import re
 import sys
+import tempfile
 from pathlib import Path
 
 # Add parent dir to path so we can import the server module
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
+from lldb_harness import (
+    LLDB_OK,
+    LLDB_PATH,
+    build_fixtures,
+    flush,
+    gather_tests,
+    out,
+    requires_lldb,
+    run_lldb_batched,
+)
+
 from lldb_mcp_server import (
-    lldb_set_breakpoint,
-    lldb_run,
-    lldb_examine_variables,
-    lldb_backtrace,
-    lldb_run_command,
-    SetBreakpointInput,
-    RunProgramInput,
-    ExamineVariablesInput,
     BacktraceInput,
-    RunCommandInput,
-    _run_lldb_script,
-    _run_lldb_command,
+    ExamineVariablesInput,
+    RunProgramInput,
+    SetBreakpointInput,
+    lldb_backtrace,
+    lldb_examine_variables,
+    lldb_run,
+    lldb_set_breakpoint,
+    release_session,
 )
 
 # Test fixtures directory
@@ -35,48 +43,66 @@ SIMPLE_EXE = FIXTURES_DIR / "simple"
 MULTIFILE_EXE = FIXTURES_DIR / "multifile"
 VARIABLES_EXE = FIXTURES_DIR / "variables"
 
+# Single-pass matchers for the multi-term output checks
+_AT_MAIN_RE = re.compile(r"main|frame", re.IGNORECASE)
+_STOPPED_RE = re.compile(r"frame|backtrace|thread", re.IGNORECASE)
+_VARS_RE = re.compile(r"x|y|argc|(?i:frame variable)")
+_BACKTRACE_RE = re.compile(r"(?i:frame)|add|#0")
+_CONDITION_RE = re.compile(r"(?i:condition)|a > 5")
+
+# Debug session shared by the tests that set breakpoints in SIMPLE_EXE
+SIMPLE_SESSION = "simple"
+
+# Resolved once, rather than rebuilt by every test
+SIMPLE_EXE_STR = str(SIMPLE_EXE)
+SIMPLE_CPP = str((FIXTURES_DIR / "simple.cpp").resolve())
+HELPER_CPP = str((FIXTURES_DIR / "multifile_helper.cpp").resolve())
+
 
 def print_header(text):
-    print("\n" + "=" * 60)
-    print(f"  {text}")
-    print("=" * 60)
+    print("\n" + "=" * 60, file=out)
+    print(f"  {text}", file=out)
+    print("=" * 60, file=out)
 
 
 def print_test(name, passed, details=""):
     status = "PASS" if passed else "FAIL"
-    print(f"  [{status}] {name}")
+    print(f"  [{status}] {name}", file=out)
     if details and not passed:
-        print(f"         Details: {details[:200]}")
+        print(f"         Details: {details[:200]}", file=out)
 
 
-async def test_function_breakpoint():
+@requires_lldb
+async def test_function_breakpoint(session_id=None):
     """Test setting breakpoint by function name."""
     print_header("Test: Function Name Breakpoint")
 
     # Test 1: Breakpoint on 'add' function
-    params = SetBreakpointInput(executable=str(SIMPLE_EXE), location="add")
+    params = SetBreakpointInput(executable=SIMPLE_EXE_STR, location="add", session_id=session_id)
     result = await lldb_set_breakpoint(params)
     has_breakpoint = "Breakpoint" in result and ("add" in result or "1 location" in result.lower())
     print_test("Set breakpoint on 'add' function", has_breakpoint, result)
 
     # Test 2: Breakpoint on 'main' function
-    params = SetBreakpointInput(executable=str(SIMPLE_EXE), location="main")
+    params = SetBreakpointInput(executable=SIMPLE_EXE_STR, location="main", session_id=session_id)
     result = await lldb_set_breakpoint(params)
     has_breakpoint = "Breakpoint" in result and ("main" in result or "1 location" in result.lower())
     print_test("Set breakpoint on 'main' function", has_breakpoint, result)
 
+    flush()
     return has_breakpoint
 
 
-async def test_file_line_breakpoint():
+@requires_lldb
+async def test_file_line_breakpoint(session_id=None):
     """Test setting breakpoint by file:line."""
     print_header("Test: File:Line Breakpoint")
 
     # Test with absolute path
-    abs_path = str(FIXTURES_DIR / "simple.cpp")
     params = SetBreakpointInput(
-        executable=str(SIMPLE_EXE),
-        location=f"{abs_path}:6",  # Line 6 in add() function
+        executable=SIMPLE_EXE_STR,
+        location=f"{SIMPLE_CPP}:6",  # Line 6 in add() function
+        session_id=session_id,
     )
     result = await lldb_set_breakpoint(params)
     has_breakpoint = "Breakpoint" in result
@@ -84,7 +110,7 @@ async def test_file_line_breakpoint():
 
     # Test with relative filename
     params = SetBreakpointInput(
-        executable=str(SIMPLE_EXE),
+        executable=SIMPLE_EXE_STR,
         location="simple.cpp:16",  # Line 16 in main()
         working_dir=str(FIXTURES_DIR),
     )
@@ -93,182 +119,195 @@ async def test_file_line_breakpoint():
     print_test("Set breakpoint with relative file:line", has_breakpoint, result)
 
     # Test multifile - breakpoint in helper file
-    abs_helper = str(FIXTURES_DIR / "multifile_helper.cpp")
     params = SetBreakpointInput(
         executable=str(MULTIFILE_EXE),
-        location=f"{abs_helper}:5",  # Line 5 in helper_double()
+        location=f"{HELPER_CPP}:5",  # Line 5 in helper_double()
     )
     result = await lldb_set_breakpoint(params)
     has_breakpoint = "Breakpoint" in result
     print_test("Set breakpoint in helper file", has_breakpoint, result)
 
+    flush()
     return has_breakpoint
 
 
+@requires_lldb
 async def test_breakpoint_from_different_dirs():
     """Test breakpoints work from different working directories."""
     print_header("Test: Breakpoints from Different Working Directories")
 
-    original_cwd = os.getcwd()
-
-    try:
-        import tempfile
-        tmp_dir = tempfile.gettempdir()
-
-        # Test 1: From temp dir
-        os.chdir(tmp_dir)
-        params = SetBreakpointInput(executable=str(SIMPLE_EXE), location="main")
-        result = await lldb_set_breakpoint(params)
-        passed_tmp = "Breakpoint" in result and "main" in result
-        print_test("Breakpoint from temp dir", passed_tmp, result)
-
-        # Test 2: From home directory
-        os.chdir(os.path.expanduser("~"))
-        params = SetBreakpointInput(executable=str(SIMPLE_EXE), location="add")
-        result = await lldb_set_breakpoint(params)
-        passed_home = "Breakpoint" in result
-        print_test("Breakpoint from home dir", passed_home, result)
-
-        # Test 3: File:line from different directory
-        os.chdir(tmp_dir)
-        abs_path = str(FIXTURES_DIR / "simple.cpp")
-        params = SetBreakpointInput(executable=str(SIMPLE_EXE), location=f"{abs_path}:6")
-        result = await lldb_set_breakpoint(params)
-        passed_fileline = "Breakpoint" in result
-        print_test("File:line breakpoint from temp dir", passed_fileline, result)
-
-    finally:
-        os.chdir(original_cwd)
+    tmp_dir = tempfile.gettempdir()
+
+    # Test 1: From temp dir
+    params = SetBreakpointInput(executable=SIMPLE_EXE_STR, location="main", working_dir=tmp_dir)
+    result = await lldb_set_breakpoint(params)
+    passed_tmp = "Breakpoint" in result and "main" in result
+    print_test("Breakpoint from temp dir", passed_tmp, result)
 
+    # Test 2: From home directory
+    params = SetBreakpointInput(
+        executable=SIMPLE_EXE_STR, location="add", working_dir=os.path.expanduser("~")
+    )
+    result = await lldb_set_breakpoint(params)
+    passed_home = "Breakpoint" in result
+    print_test("Breakpoint from home dir", passed_home, result)
+
+    # Test 3: File:line from different directory
+    params = SetBreakpointInput(
+        executable=SIMPLE_EXE_STR, location=f"{SIMPLE_CPP}:6", working_dir=tmp_dir
+    )
+    result = await lldb_set_breakpoint(params)
+    passed_fileline = "Breakpoint" in result
+    print_test("File:line breakpoint from temp dir", passed_fileline, result)
+
+    flush()
     return passed_tmp and passed_home and passed_fileline
 
 
+@requires_lldb
 async def test_run_with_breakpoints():
     """Test running program with breakpoints."""
     print_header("Test: Run Program with Breakpoints")
 
     # Test 1: Run with function breakpoint
-    params = RunProgramInput(executable=str(SIMPLE_EXE), breakpoints=["main"], stop_at_entry=True)
+    params = RunProgramInput(executable=SIMPLE_EXE_STR, breakpoints=["main"], stop_at_entry=True)
     result = await lldb_run(params)
-    stopped_at_main = "main" in result.lower() or "frame" in result.lower()
+    stopped_at_main = _AT_MAIN_RE.search(result) is not None
     print_test("Run with breakpoint at main", stopped_at_main, result)
 
     # Test 2: Run with file:line breakpoint
-    abs_path = str(FIXTURES_DIR / "simple.cpp")
     params = RunProgramInput(
-        executable=str(SIMPLE_EXE),
-        breakpoints=[f"{abs_path}:19"],  # Line with add() call
+        executable=SIMPLE_EXE_STR,
+        breakpoints=[f"{SIMPLE_CPP}:19"],  # Line with add() call
         stop_at_entry=False,
     )
     result = await lldb_run(params)
-    has_output = (
-        "frame" in result.lower() or "backtrace" in result.lower() or "thread" in result.lower()
-    )
+    has_output = _STOPPED_RE.search(result) is not None
     print_test("Run with file:line breakpoint", has_output, result)
 
+    flush()
     return stopped_at_main
 
 
+@requires_lldb
 async def test_examine_variables_at_breakpoint():
     """Test examining variables at a breakpoint."""
     print_header("Test: Examine Variables at Breakpoint")
 
-    params = ExamineVariablesInput(executable=str(SIMPLE_EXE), breakpoint="main")
+    params = ExamineVariablesInput(executable=SIMPLE_EXE_STR, breakpoint="main")
     result = await lldb_examine_variables(params)
-    has_vars = (
-        "x" in result or "y" in result or "argc" in result or "frame variable" in result.lower()
-    )
+    has_vars = _VARS_RE.search(result) is not None
     print_test("Examine variables at main", has_vars, result)
 
+    flush()
     return has_vars
 
 
+@requires_lldb
 async def test_backtrace_at_breakpoint():
     """Test getting backtrace at a breakpoint."""
     print_header("Test: Backtrace at Breakpoint")
 
-    params = BacktraceInput(executable=str(SIMPLE_EXE), breakpoint="add")
+    params = BacktraceInput(executable=SIMPLE_EXE_STR, breakpoint="add")
     result = await lldb_backtrace(params)
-    has_backtrace = "frame" in result.lower() or "add" in result or "#0" in result
+    has_backtrace = _BACKTRACE_RE.search(result) is not None
     print_test("Backtrace at 'add' function", has_backtrace, result)
 
+    flush()
     return has_backtrace
 
 
+@requires_lldb
 async def test_raw_lldb_breakpoint():
     """Test raw LLDB commands to diagnose issues."""
     print_header("Test: Raw LLDB Breakpoint Commands (Diagnostic)")
 
-    # Test direct LLDB command
-    commands = [
-        f"target create {SIMPLE_EXE}",
-        "breakpoint set --name main",
-        "breakpoint list",
-    ]
-    result = _run_lldb_script(commands)
-    print(f"  Raw LLDB output:\n{result['output'][:500]}")
-
-    has_breakpoint = "Breakpoint 1" in result["output"]
-    print_test("Raw LLDB breakpoint set --name main", has_breakpoint, result["output"])
-
-    # Test file:line with raw LLDB
-    abs_path = str(FIXTURES_DIR / "simple.cpp")
-    commands = [
-        f"target create {SIMPLE_EXE}",
-        f"breakpoint set --file {abs_path} --line 6",
-        "breakpoint list",
-    ]
-    result = _run_lldb_script(commands)
-    print(f"  Raw LLDB file:line output:\n{result['output'][:500]}")
-
-    has_breakpoint = "Breakpoint 1" in result["output"] or "1 location" in result["output"]
-    print_test("Raw LLDB breakpoint set --file --line", has_breakpoint, result["output"])
+    # Test direct LLDB command and file:line with raw LLDB, in one LLDB call
+    by_name, by_line = await run_lldb_batched(
+        [
+            [
+                f"target create {SIMPLE_EXE_STR}",
+                "breakpoint set --name main",
+                "breakpoint list",
+            ],
+            [
+                f"target create {SIMPLE_EXE_STR}",
+                f"breakpoint set --file {SIMPLE_CPP} --line 6",
+                "breakpoint list",
+            ],
+        ]
+    )
+    print(f"  Raw LLDB output:\n{by_name[:500]}", file=out)
+
+    has_breakpoint = "Breakpoint 1" in by_name
+    print_test("Raw LLDB breakpoint set --name main", has_breakpoint, by_name)
+
+    print(f"  Raw LLDB file:line output:\n{by_line[:500]}", file=out)
 
+    has_breakpoint = "Breakpoint 1" in by_line or "1 location" in by_line
+    print_test("Raw LLDB breakpoint set --file --line", has_breakpoint, by_line)
+
+    flush()
     return has_breakpoint
 
 
-async def test_conditional_breakpoint():
+@requires_lldb
+async def test_conditional_breakpoint(session_id=None):
     """Test conditional breakpoint."""
     print_header("Test: Conditional Breakpoint")
 
-    params = SetBreakpointInput(executable=str(SIMPLE_EXE), location="add", condition="a > 5")
+    params = SetBreakpointInput(
+        executable=SIMPLE_EXE_STR, location="add", condition="a > 5", session_id=session_id
+    )
     result = await lldb_set_breakpoint(params)
     has_breakpoint = "Breakpoint" in result
-    has_condition = "condition" in result.lower() or "a > 5" in result
+    has_condition = _CONDITION_RE.search(result) is not None
     print_test("Set conditional breakpoint", has_breakpoint, result)
     print_test("Condition appears in output", has_condition, result)
 
+    flush()
     return has_breakpoint
 
 
 async def main():
     """Run all tests."""
-    print("\n" + "#" * 60)
-    print("#  LLDB MCP Server - Breakpoint Test Suite")
-    print("#" * 60)
+    print("\n" + "#" * 60, file=out)
+    print("#  LLDB MCP Server - Breakpoint Test Suite", file=out)
+    print("#" * 60, file=out)
+
+    if not LLDB_OK:
+        print("\n  LLDB missing, skipping\n", file=out)
+        flush()
+        return True
 
     # Check prerequisites
     print_header("Prerequisites Check")
-    print(f"  Test fixtures dir: {FIXTURES_DIR}")
-    print(f"  Simple executable: {SIMPLE_EXE} (exists: {SIMPLE_EXE.exists()})")
-    print(f"  Multifile executable: {MULTIFILE_EXE} (exists: {MULTIFILE_EXE.exists()})")
-    print(f"  Variables executable: {VARIABLES_EXE} (exists: {VARIABLES_EXE.exists()})")
+    for name, error in (await build_fixtures()).items():
+        print(f"  Could not build fixture '{name}': {error[:200]}", file=out)
+    print(f"  Test fixtures dir: {FIXTURES_DIR}", file=out)
+    print(f"  Simple executable: {SIMPLE_EXE} (exists: {SIMPLE_EXE.exists()})", file=out)
+    print(f"  Multifile executable: {MULTIFILE_EXE} (exists: {MULTIFILE_EXE.exists()})", file=out)
+    print(f"  Variables executable: {VARIABLES_EXE} (exists: {VARIABLES_EXE.exists()})", file=out)
 
     # Check LLDB
-    lldb_check = subprocess.run(["which", "lldb"], capture_output=True, text=True)
-    print(f"  LLDB path: {lldb_check.stdout.strip()}")
-
-    results = []
-
-    # Run tests
-    results.append(("Raw LLDB Diagnostic", await test_raw_lldb_breakpoint()))
-    results.append(("Function Breakpoint", await test_function_breakpoint()))
-    results.append(("File:Line Breakpoint", await test_file_line_breakpoint()))
-    results.append(("Different Working Dirs", await test_breakpoint_from_different_dirs()))
-    results.append(("Run with Breakpoints", await test_run_with_breakpoints()))
-    results.append(("Examine Variables", await test_examine_variables_at_breakpoint()))
-    results.append(("Backtrace", await test_backtrace_at_breakpoint()))
-    results.append(("Conditional Breakpoint", await test_conditional_breakpoint()))
+    print(f"  LLDB path: {LLDB_PATH or ''}", file=out)
+
+    flush()
+
+    # Run tests concurrently; none of them changes the process CWD
+    results = await gather_tests(
+        (
+            ("Raw LLDB Diagnostic", test_raw_lldb_breakpoint()),
+            ("Function Breakpoint", test_function_breakpoint(SIMPLE_SESSION)),
+            ("File:Line Breakpoint", test_file_line_breakpoint(SIMPLE_SESSION)),
+            ("Different Working Dirs", test_breakpoint_from_different_dirs()),
+            ("Run with Breakpoints", test_run_with_breakpoints()),
+            ("Examine Variables", test_examine_variables_at_breakpoint()),
+            ("Backtrace", test_backtrace_at_breakpoint()),
+            ("Conditional Breakpoint", test_conditional_breakpoint(SIMPLE_SESSION)),
+        )
+    )
+    release_session(SIMPLE_SESSION)
 
     # Summary
     print_header("Test Summary")
@@ -276,11 +315,12 @@ async def main():
     total = len(results)
     for name, result in results:
         status = "PASS" if result else "FAIL"
-        print(f"  [{status}] {name}")
+        print(f"  [{status}] {name}", file=out)
 
-    print(f"\n  Total: {passed}/{total} tests passed")
-    print("#" * 60 + "\n")
+    print(f"\n  Total: {passed}/{total} tests passed", file=out)
+    print("#" * 60 + "\n", file=out)
 
+    flush()
     return passed == total
 
 
@@ -1,43 +1,106 @@
 #!/usr/bin/env python3
 """
 Integration tests that simulate how Claude Code calls the MCP server.
-Tests the server through JSON-RPC protocol over stdio.
+Tools are called through the server's registered MCP tools in-process; pass
+--stdio to also run a smoke test over the JSON-RPC stdio transport.
 """
 
 import asyncio
 import json
-import subprocess
+import re
 import sys
 import tempfile
 from pathlib import Path
 
+from lldb_harness import (
+    LLDB_OK,
+    build_fixtures,
+    flush,
+    gather_tests,
+    out,
+    requires_lldb,
+    run_lldb,
+    run_lldb_batched,
+)
+
+from lldb_mcp_server import _orjson, mcp
+
 # Test fixtures directory
 FIXTURES_DIR = Path(__file__).parent
 SIMPLE_EXE = FIXTURES_DIR / ("simple.exe" if sys.platform == "win32" else "simple")
 SERVER_PATH = FIXTURES_DIR.parent / "lldb_mcp_server.py"
 
 
+def _frame(message):
+    """Serialize one JSON-RPC message as a stdio line, using orjson when it is installed."""
+    orjson = _orjson()
+    if orjson is not None:
+        return orjson.dumps(message) + b"\n"
+    return json.dumps(message, separators=(",", ":"), ensure_ascii=False).encode() + b"\n"
+
+
+# The initialize handshake every stdio call starts with, serialized once
+_INIT_BYTES = b"".join(
+    _frame(message)
+    for message in (
+        {
+            "jsonrpc": "2.0",
+            "id": 0,
+            "method": "initialize",
+            "params": {
+                "protocolVersion": "2024-11-05",
+                "capabilities": {},
+                "clientInfo": {"name": "test", "version": "1.0.0"},
+            },
+        },
+        {"jsonrpc": "2.0", "method": "notifications/initialized"},
+    )
+)
+
+# Single-pass matchers for the multi-term output checks
+_VAR_RE = re.compile(r"\(int\) ([ab])|([ab]) =")
+_STOP_RE = re.compile(r"(?P<main>main)|(?P<frame>(?i:frame)|#)")
+_AT_MAIN_RE = re.compile(r"main|frame", re.IGNORECASE)
+_STOPPED_RE = re.compile(r"frame|thread|backtrace", re.IGNORECASE)
+
+# Resolved once, rather than rebuilt by every test
+SIMPLE_EXE_STR = str(SIMPLE_EXE)
+SIMPLE_CPP = str((FIXTURES_DIR / "simple.cpp").resolve())
+
+
 def print_header(text):
-    print("\n" + "=" * 60)
-    print(f"  {text}")
-    print("=" * 60)
+    print("\n" + "=" * 60, file=out)
+    print(f"  {text}", file=out)
+    print("=" * 60, file=out)
 
 
-def print_test(name, passed, details=""):
+def print_test(name, passed, details="", limit=300):
     status = "PASS" if passed else "FAIL"
-    print(f"  [{status}] {name}")
-    if details:
-        # Truncate long details
-        if len(details) > 300:
-            details = details[:300] + "..."
-        print(f"         {details}")
+    print(f"  [{status}] {name}", file=out)
+    if details and not passed:
+        # Truncate long details; only failures pay for the slice
+        if len(details) > limit:
+            details = details[:limit] + "..."
+        print(f"         {details}", file=out)
 
 
-async def call_mcp_tool(tool_name, arguments, cwd=None):
+async def call_mcp_tool(tool_name, arguments):
+    """
+    Call an MCP tool in-process, the way the server dispatches a tools/call.
+
+    Arguments are validated against the tool's schema just as they are for a
+    stdio request; returns the text of the tool's response.
+    """
+    content, _ = await mcp.call_tool(tool_name, arguments)
+    return "".join(block.text for block in content)
+
+
+async def call_mcp_tool_stdio(tool_name, arguments, cwd=None):
     """
     Call an MCP tool through the server's stdio interface.
 
-    This simulates how Claude Code actually calls tools.
+    This simulates how Claude Code actually calls tools, at the cost of a
+    server process per call.
     """
     # Build the JSON-RPC request
     request = {
@@ -47,21 +110,7 @@ async def call_mcp_tool(tool_name, arguments, cwd=None):
         "params": {"name": tool_name, "arguments": arguments},
     }
 
-    request_json = json.dumps(request)
-
-    # Also need to initialize the server first
-    init_request = {
-        "jsonrpc": "2.0",
-        "id": 0,
-        "method": "initialize",
-        "params": {
-            "protocolVersion": "2024-11-05",
-            "capabilities": {},
-            "clientInfo": {"name": "test", "version": "1.0.0"},
-        },
-    }
-
-    init_json = json.dumps(init_request)
+    request_bytes = _frame(request)
 
     # Run the MCP server as a subprocess
     proc = await asyncio.create_subprocess_exec(
@@ -75,13 +124,24 @@ async def call_mcp_tool(tool_name, arguments, cwd=None):
 
     try:
         # Send initialization and tool call
-        # MCP uses Content-Length headers
-        init_msg = f"Content-Length: {len(init_json)}\r\n\r\n{init_json}"
-        tool_msg = f"Content-Length: {len(request_json)}\r\n\r\n{request_json}"
+        # The MCP stdio transport sends one JSON message per line
+        proc.stdin.write(_INIT_BYTES + request_bytes)
+        await proc.stdin.drain()
+
+        # The server cancels requests still running when its stdin closes, so
+        # keep it open until the tool call's response arrives
+        replies = []
 
-        full_input = (init_msg + tool_msg).encode()
+        async def read_reply():
+            async for line in proc.stdout:
+                replies.append(line)
+                if json.loads(line).get("id") == 1:
+                    break
 
-        stdout, stderr = await asyncio.wait_for(proc.communicate(input=full_input), timeout=30.0)
+        await asyncio.wait_for(read_reply(), timeout=30.0)
+        proc.stdin.close()
+        rest, stderr = await asyncio.wait_for(proc.communicate(), timeout=30.0)
+        stdout = b"".join(replies) + rest
 
         return {"stdout": stdout.decode(), "stderr": stderr.decode(), "returncode": proc.returncode}
     except asyncio.TimeoutError:
@@ -89,62 +149,47 @@ async def call_mcp_tool(tool_name, arguments, cwd=None):
         return {"stdout": "", "stderr": "Timeout", "returncode": -1}
 
 
+@requires_lldb
 async def test_direct_lldb():
     """Test LLDB directly to ensure it works."""
     print_header("Test: Direct LLDB Verification")
 
-    # Test 1: Basic LLDB command
-    result = subprocess.run(
-        ["lldb", "--batch", "-o", "version"], capture_output=True, text=True, timeout=10
-    )
-    passed = result.returncode == 0 and "lldb" in result.stdout.lower()
-    print_test("LLDB version command", passed, result.stdout[:100])
-
-    # Test 2: Set breakpoint on our test executable
-    result = subprocess.run(
+    # All three checks share one LLDB call
+    version, breakpoint, stopped = await run_lldb_batched(
         [
-            "lldb",
-            "--batch",
-            "-o",
-            f"target create {SIMPLE_EXE}",
-            "-o",
-            "breakpoint set --name main",
-            "-o",
-            "breakpoint list",
-        ],
-        capture_output=True,
-        text=True,
-        timeout=10,
-    )
-    passed = "Breakpoint 1" in result.stdout
-    print_test("LLDB breakpoint on main", passed, result.stdout[:200])
-
-    # Test 3: Run to breakpoint
-    result = subprocess.run(
-        [
-            "lldb",
-            "--batch",
-            "-o",
-            f"target create {SIMPLE_EXE}",
-            "-o",
-            "breakpoint set --name main",
-            "-o",
-            "run",
-            "-o",
-            "bt",
-            "-o",
-            "quit",
+            # Test 1: Basic LLDB command
+            ["version"],
+            # Test 2: Set breakpoint on our test executable
+            [
+                f"target create {SIMPLE_EXE_STR}",
+                "breakpoint set --name main",
+                "breakpoint list",
+            ],
+            # Test 3: Run to breakpoint
+            [
+                f"target create {SIMPLE_EXE_STR}",
+                "breakpoint set --name main",
+                "run",
+                "bt",
+            ],
         ],
-        capture_output=True,
-        text=True,
         timeout=30,
     )
-    passed = "main" in result.stdout and ("frame" in result.stdout.lower() or "#" in result.stdout)
-    print_test("LLDB run to breakpoint", passed, result.stdout[:300])
 
+    passed = "lldb" in version.lower()
+    print_test("LLDB version command", passed, version, limit=100)
+
+    passed = "Breakpoint 1" in breakpoint
+    print_test("LLDB breakpoint on main", passed, breakpoint, limit=200)
+
+    passed = {m.lastgroup for m in _STOP_RE.finditer(stopped)} == {"main", "frame"}
+    print_test("LLDB run to breakpoint", passed, stopped)
+
+    flush()
     return passed
 
 
+@requires_lldb
 async def test_breakpoint_from_different_dirs():
     """Test breakpoints work when called from different directories."""
     print_header("Test: Breakpoint from Different Working Directories")
@@ -155,210 +200,197 @@ async def test_breakpoint_from_different_dirs():
         (str(FIXTURES_DIR), "fixtures"),
     ]
 
-    all_passed = True
+    existing = []
     for test_dir, name in dirs_to_test:
         if not Path(test_dir).exists():
             print_test(f"Breakpoint from {name}", False, f"Directory {test_dir} does not exist")
             continue
+        existing.append((test_dir, name))
 
-        # Call LLDB directly from the different directory
-        result = subprocess.run(
-            [
-                "lldb",
-                "--batch",
-                "-o",
-                f"target create {SIMPLE_EXE}",
-                "-o",
-                "breakpoint set --name add",
-                "-o",
-                "breakpoint list",
-            ],
-            capture_output=True,
-            text=True,
-            timeout=10,
-            cwd=test_dir,
-        )
-        passed = "Breakpoint 1" in result.stdout and "add" in result.stdout
-        print_test(f"Breakpoint from {name} ({test_dir})", passed, result.stdout[:150])
+    # Call LLDB directly from every directory at once; each has its own LLDB process
+    commands = [
+        f"target create {SIMPLE_EXE_STR}",
+        "breakpoint set --name add",
+        "breakpoint list",
+    ]
+    results = await asyncio.gather(
+        *(run_lldb(commands, timeout=10, cwd=test_dir) for test_dir, _ in existing)
+    )
+
+    all_passed = True
+    for (test_dir, name), result in zip(existing, results):
+        passed = "Breakpoint 1" in result["output"] and "add" in result["output"]
+        print_test(f"Breakpoint from {name} ({test_dir})", passed, result["output"], limit=150)
         all_passed = all_passed and passed
 
+    flush()
     return all_passed
 
 
+@requires_lldb
 async def test_file_line_breakpoints():
     """Test file:line breakpoints with various path formats."""
     print_header("Test: File:Line Breakpoints with Path Variations")
 
-    source_file = FIXTURES_DIR / "simple.cpp"
-
     tests = [
-        # (file_path, line, description)
-        (str(source_file), "6", "Absolute path"),
-        ("simple.cpp", "6", "Relative filename (from fixtures dir)"),
+        # (file_path, line, working directory, description)
+        (SIMPLE_CPP, "6", None, "File:Line - Absolute path"),
+        ("simple.cpp", "6", str(FIXTURES_DIR), "File:Line - Relative filename (from fixtures dir)"),
+        (
+            SIMPLE_CPP,
+            "6",
+            tempfile.gettempdir(),
+            "File:Line from temp dir with absolute path",
+        ),
     ]
 
-    all_passed = True
-    for file_path, line, desc in tests:
-        cwd = str(FIXTURES_DIR) if not Path(file_path).is_absolute() else None
-
-        result = subprocess.run(
-            [
-                "lldb",
-                "--batch",
-                "-o",
-                f"target create {SIMPLE_EXE}",
-                "-o",
-                f"breakpoint set --file {file_path} --line {line}",
-                "-o",
-                "breakpoint list",
-            ],
-            capture_output=True,
-            text=True,
-            timeout=10,
-            cwd=cwd,
+    results = await asyncio.gather(
+        *(
+            run_lldb(
+                [
+                    f"target create {SIMPLE_EXE_STR}",
+                    f"breakpoint set --file {file_path} --line {line}",
+                    "breakpoint list",
+                ],
+                timeout=10,
+                cwd=cwd,
+            )
+            for file_path, line, cwd, _ in tests
         )
-        passed = "Breakpoint 1" in result.stdout
-        print_test(f"File:Line - {desc}", passed, result.stdout[:150])
-        all_passed = all_passed and passed
-
-    # Test from different directory with absolute path
-    result = subprocess.run(
-        [
-            "lldb",
-            "--batch",
-            "-o",
-            f"target create {SIMPLE_EXE}",
-            "-o",
-            f"breakpoint set --file {source_file} --line 6",
-            "-o",
-            "breakpoint list",
-        ],
-        capture_output=True,
-        text=True,
-        timeout=10,
-        cwd=tempfile.gettempdir(),
     )
-    passed = "Breakpoint 1" in result.stdout
-    print_test("File:Line from temp dir with absolute path", passed, result.stdout[:150])
-    all_passed = all_passed and passed
 
+    all_passed = True
+    for (_, _, _, desc), result in zip(tests, results):
+        passed = "Breakpoint 1" in result["output"]
+        print_test(desc, passed, result["output"], limit=150)
+        all_passed = all_passed and passed
+
+    flush()
     return all_passed
 
 
+@requires_lldb
 async def test_mcp_server_tool_call():
     """Test calling MCP tools directly (simulating Claude Code)."""
     print_header("Test: MCP Server Tool Calls")
 
-    # Import and call tools directly
-    sys.path.insert(0, str(FIXTURES_DIR.parent))
-
-    from lldb_mcp_server import (
-        lldb_set_breakpoint,
-        lldb_run,
-        SetBreakpointInput,
-        RunProgramInput,
-    )
-
     # Test 1: Set breakpoint via MCP tool
-    params = SetBreakpointInput(executable=str(SIMPLE_EXE), location="main")
-    result = await lldb_set_breakpoint(params)
+    params = {"executable": SIMPLE_EXE_STR, "location": "main"}
+    result = await call_mcp_tool("lldb_set_breakpoint", {"params": params})
     passed = "Breakpoint" in result and "main" in result
-    print_test("MCP lldb_set_breakpoint (function)", passed, result[:200])
+    print_test("MCP lldb_set_breakpoint (function)", passed, result, limit=200)
 
     # Test 2: Set breakpoint with file:line
-    params = SetBreakpointInput(executable=str(SIMPLE_EXE), location=f"{FIXTURES_DIR}/simple.cpp:6")
-    result = await lldb_set_breakpoint(params)
+    params = {"executable": SIMPLE_EXE_STR, "location": f"{SIMPLE_CPP}:6"}
+    result = await call_mcp_tool("lldb_set_breakpoint", {"params": params})
     passed = "Breakpoint" in result
-    print_test("MCP lldb_set_breakpoint (file:line)", passed, result[:200])
+    print_test("MCP lldb_set_breakpoint (file:line)", passed, result, limit=200)
 
     # Test 3: Run with breakpoints
-    params = RunProgramInput(executable=str(SIMPLE_EXE), breakpoints=["main"], stop_at_entry=True)
-    result = await lldb_run(params)
-    passed = "main" in result.lower() or "frame" in result.lower()
-    print_test("MCP lldb_run with breakpoint", passed, result[:300])
+    params = {"executable": SIMPLE_EXE_STR, "breakpoints": ["main"], "stop_at_entry": True}
+    result = await call_mcp_tool("lldb_run", {"params": params})
+    passed = _AT_MAIN_RE.search(result) is not None
+    print_test("MCP lldb_run with breakpoint", passed, result)
 
     # Test 4: Run with file:line breakpoint
-    params = RunProgramInput(
-        executable=str(SIMPLE_EXE),
-        breakpoints=[f"{FIXTURES_DIR}/simple.cpp:19"],
-        stop_at_entry=False,
-    )
-    result = await lldb_run(params)
-    passed = (
-        "frame" in result.lower() or "thread" in result.lower() or "backtrace" in result.lower()
-    )
-    print_test("MCP lldb_run with file:line breakpoint", passed, result[:300])
+    params = {
+        "executable": SIMPLE_EXE_STR,
+        "breakpoints": [f"{SIMPLE_CPP}:19"],
+        "stop_at_entry": False,
+    }
+    result = await call_mcp_tool("lldb_run", {"params": params})
+    passed = _STOPPED_RE.search(result) is not None
+    print_test("MCP lldb_run with file:line breakpoint", passed, result)
+
+    flush()
+    return passed
+
+
+async def test_stdio_tool_call():
+    """Smoke-test a tool call over the real stdio transport."""
+    print_header("Test: MCP stdio Transport")
 
+    result = await call_mcp_tool_stdio("lldb_version", {})
+    passed = result["returncode"] == 0 and '"id":1' in result["stdout"]
+    print_test("lldb_version over stdio", passed, result["stdout"] or result["stderr"])
+
+    flush()
     return passed
 
 
+@requires_lldb
 async def test_breakpoint_actually_stops():
     """Test that the program actually stops at the breakpoint."""
     print_header("Test: Breakpoint Actually Stops Execution")
 
     # Run program with breakpoint and check that we can see local variables
-    result = subprocess.run(
+    result = await run_lldb(
         [
-            "lldb",
-            "--batch",
-            "-o",
-            f"target create {SIMPLE_EXE}",
-            "-o",
+            f"target create {SIMPLE_EXE_STR}",
             "breakpoint set --name add",
-            "-o",
             "run",
-            "-o",
             "frame variable",
-            "-o",
             "quit",
         ],
-        capture_output=True,
-        text=True,
         timeout=30,
     )
 
     # We should see the 'a' and 'b' parameters from the add function
-    passed = ("a =" in result.stdout or "(int) a" in result.stdout) and (
-        "b =" in result.stdout or "(int) b" in result.stdout
-    )
-    print_test("Variables visible at breakpoint", passed, result.stdout[:400])
+    names = {a or b for a, b in _VAR_RE.findall(result["output"])}
+    passed = names == {"a", "b"}
+    print_test("Variables visible at breakpoint", passed, result["output"], limit=400)
 
     # Check we stopped in the right function
-    stopped_in_add = "add" in result.stdout
+    stopped_in_add = "add" in result["output"]
     print_test("Stopped in 'add' function", stopped_in_add, "")
 
+    flush()
     return passed and stopped_in_add
 
 
 async def main():
     """Run all integration tests."""
-    print("\n" + "#" * 60)
-    print("#  LLDB MCP Server - Integration Test Suite")
-    print("#" * 60)
+    print("\n" + "#" * 60, file=out)
+    print("#  LLDB MCP Server - Integration Test Suite", file=out)
+    print("#" * 60, file=out)
 
-    print_header("Prerequisites")
-    print(f"  Test fixtures: {FIXTURES_DIR}")
-    print(f"  Simple executable: {SIMPLE_EXE}")
-    print(f"  Server path: {SERVER_PATH}")
-
-    results = []
+    if not LLDB_OK:
+        print("\n  LLDB missing, skipping\n", file=out)
+        flush()
+        return True
 
-    results.append(("Direct LLDB", await test_direct_lldb()))
-    results.append(("Different Working Dirs", await test_breakpoint_from_different_dirs()))
-    results.append(("File:Line Breakpoints", await test_file_line_breakpoints()))
-    results.append(("MCP Tool Calls", await test_mcp_server_tool_call()))
-    results.append(("Breakpoint Stops Execution", await test_breakpoint_actually_stops()))
+    print_header("Prerequisites")
+    for name, error in (await build_fixtures()).items():
+        print(f"  Could not build fixture '{name}': {error[:200]}", file=out)
+    print(f"  Test fixtures: {FIXTURES_DIR}", file=out)
+    print(f"  Simple executable: {SIMPLE_EXE}", file=out)
+    print(f"  Server path: {SERVER_PATH}", file=out)
+
+    flush()
+
+    # Run tests concurrently; none of them changes the process CWD
+    specs = [
+        ("Direct LLDB", test_direct_lldb()),
+        ("Different Working Dirs", test_breakpoint_from_different_dirs()),
+        ("File:Line Breakpoints", test_file_line_breakpoints()),
+        ("MCP Tool Calls", test_mcp_server_tool_call()),
+        ("Breakpoint Stops Execution", test_breakpoint_actually_stops()),
+    ]
+    if "--stdio" in sys.argv:
+        specs.append(("MCP stdio Transport", test_stdio_tool_call()))
+    results = await gather_tests(specs)
 
     print_header("Integration Test Summary")
     passed = sum(1 for _, r in results if r)
     total = len(results)
     for name, result in results:
         status = "PASS" if result else "FAIL"
-        print(f"  [{status}] {name}")
+        print(f"  [{status}] {name}", file=out)
 
-    print(f"\n  Total: {passed}/{total} tests passed")
-    print("#" * 60 + "\n")
+    print(f"\n  Total: {passed}/{total} tests passed", file=out)
+    print("#" * 60 + "\n", file=out)
 
+    flush()
     return passed == total
 
 
@@ -11,6 +11,34 @@ This script verifies that:
 import shutil
 import subprocess
 
+# Looked up once for the whole module
+LLDB_PATH = shutil.which("lldb")
+
+EXPECTED_TOOLS: frozenset[str] = frozenset(
+    {
+        "lldb_run_command",
+        "lldb_analyze_crash",
+        "lldb_set_breakpoint",
+        "lldb_examine_variables",
+        "lldb_inspect",
+        "lldb_disassemble",
+        "lldb_read_memory",
+        "lldb_evaluate",
+        "lldb_backtrace",
+        "lldb_source",
+        "lldb_symbols",
+        "lldb_registers",
+        "lldb_watchpoint",
+        "lldb_run",
+        "lldb_threads",
+        "lldb_images",
+        "lldb_help",
+        "lldb_version",
+        "lldb_invalidate_cache",
+        "lldb_release_session",
+    }
+)
+
 
 def test_imports():
     """Test that all required imports work."""
@@ -32,44 +60,677 @@ def test_server_creation():
 
 
 def test_tools_registered():
-    """Test that tools are properly registered."""
+    """Test that exactly the expected tools are registered."""
     import lldb_mcp_server
 
-    mcp = lldb_mcp_server.mcp
-
-    expected_tools = [
-        "lldb_run_command",
-        "lldb_analyze_crash",
-        "lldb_set_breakpoint",
-        "lldb_examine_variables",
-        "lldb_disassemble",
-        "lldb_read_memory",
-        "lldb_evaluate",
-        "lldb_backtrace",
-        "lldb_source",
-        "lldb_symbols",
-        "lldb_registers",
-        "lldb_watchpoint",
-        "lldb_run",
-        "lldb_threads",
-        "lldb_images",
-        "lldb_help",
-        "lldb_version",
-    ]
-
-    assert len(expected_tools) == 17
+    registered = {tool.name for tool in lldb_mcp_server.mcp._tool_manager.list_tools()}
+    assert registered == EXPECTED_TOOLS
 
 
 def test_lldb_available():
     """Test that LLDB is available on the system."""
-    lldb_path = shutil.which("lldb")
-    assert lldb_path is not None, "LLDB not found in PATH"
+    assert LLDB_PATH is not None, "LLDB not found in PATH"
 
     result = subprocess.run(
-        [lldb_path, "--version"],
-        capture_output=True,
+        [LLDB_PATH, "--version"],
+        stdout=subprocess.PIPE,
+        stderr=subprocess.DEVNULL,
         text=True,
         timeout=5,
     )
     assert result.returncode == 0
     assert "lldb" in result.stdout.lower()
+
+
+def test_cached_lldb_path_rechecked_before_use(monkeypatch, tmp_path):
+    """Test that a remembered lldb path that no longer exists is not returned."""
+    import hashlib
+    import os
+
+    import lldb_mcp_server
+
+    cache = tmp_path / "lldb_path"
+    path_hash = hashlib.blake2b(os.environ.get("PATH", "").encode()).hexdigest()
+    cache.write_text(f"{path_hash}\n{tmp_path / 'gone' / 'lldb'}\n")
+    monkeypatch.setattr(lldb_mcp_server, "_LLDB_PATH_CACHE", cache)
+
+    assert lldb_mcp_server._resolve_lldb() == (shutil.which("lldb") or "lldb")
+
+
+def test_symbol_lookup_cached_per_build(tmp_path, monkeypatch):
+    """Test that symbol lookups are memoized until the executable changes."""
+    import asyncio
+    import os
+
+    import lldb_mcp_server
+
+    exe = tmp_path / "prog"
+    exe.write_bytes(b"")
+    calls = []
+
+    async def fake_run(commands, *args, **kwargs):
+        calls.append(commands)
+        return {"success": True, "output": "Address: prog[0x1000]", "error": None}
+
+    monkeypatch.setattr(lldb_mcp_server, "_run_lldb_script", fake_run)
+    asyncio.run(lldb_mcp_server.lldb_invalidate_cache())
+
+    params = lldb_mcp_server.SymbolLookupInput(executable=str(exe), query="main")
+    asyncio.run(lldb_mcp_server.lldb_symbols(params))
+    asyncio.run(lldb_mcp_server.lldb_symbols(params))
+    assert len(calls) == 1
+
+    os.utime(exe, ns=(0, 0))
+    asyncio.run(lldb_mcp_server.lldb_symbols(params))
+    assert len(calls) == 2
+
+    link = tmp_path / "link"
+    link.symlink_to(exe)
+    asyncio.run(lldb_mcp_server.lldb_symbols(params.model_copy(update={"executable": str(link)})))
+    assert len(calls) == 2
+
+    # A rebuild that keeps the old mtime (cp -p, build caches) is still a new build
+    exe.write_bytes(b"rebuilt")
+    os.utime(exe, ns=(0, 0))
+    asyncio.run(lldb_mcp_server.lldb_symbols(params))
+    assert len(calls) == 3
+
+    stats = asyncio.run(lldb_mcp_server.lldb_invalidate_cache())
+    assert "hits: 2" in stats
+    assert "misses: 3" in stats
+
+
+def test_backtrace_cached_per_canonical_path(tmp_path, monkeypatch):
+    """Test that every spelling of an executable and core file shares one backtrace."""
+    import asyncio
+    import os
+
+    import lldb_mcp_server
+
+    exe = tmp_path / "prog"
+    exe.write_bytes(b"")
+    core = tmp_path / "core"
+    core.write_bytes(b"")
+    (tmp_path / "exe_link").symlink_to(exe)
+    (tmp_path / "core_link").symlink_to(core)
+    calls = []
+
+    async def fake_run(commands, *args, **kwargs):
+        calls.append((commands, kwargs.get("target")))
+        return {"success": True, "output": "frame #0: 0x1000 prog`main", "error": None}
+
+    monkeypatch.setattr(lldb_mcp_server, "_run_lldb_script", fake_run)
+    monkeypatch.chdir(tmp_path)
+    asyncio.run(lldb_mcp_server.lldb_invalidate_cache())
+
+    for spelling in (str(exe), "./prog", str(tmp_path / "exe_link")):
+        params = lldb_mcp_server.BacktraceInput(executable=spelling)
+        asyncio.run(lldb_mcp_server.lldb_backtrace(params))
+    assert len(calls) == 1
+    assert calls[0][1] == os.path.realpath(exe)
+
+    for spelling in (str(core), "core_link"):
+        params = lldb_mcp_server.BacktraceInput(executable="exe_link", core_file=spelling)
+        asyncio.run(lldb_mcp_server.lldb_backtrace(params))
+    assert len(calls) == 2
+    assert calls[1][0][0] == lldb_mcp_server._core_target_command(
+        os.path.realpath(exe), os.path.realpath(core)
+    )
+
+
+def test_parse_backtrace():
+    """Test that backtrace output is parsed into frames in a single pass."""
+    import lldb_mcp_server
+
+    output = (
+        "* thread #1, name = 'simple', stop reason = breakpoint 1.1\n"
+        "  * frame #0: 0x0000555555555131 simple`add(a=3, b=4) at simple.cpp:5:12\n"
+        "    frame #1: 0x00007ffff7829d90 libc.so.6`__libc_start_call_main + 128\n"
+    )
+    frames = lldb_mcp_server._parse_backtrace(output)
+
+    assert len(frames) == 2
+    assert frames[0].module == "simple"
+    assert frames[0].function == "add(a=3, b=4)"
+    assert frames[0].file == "simple.cpp"
+    assert frames[0].line == 5
+    assert frames[1].function == "__libc_start_call_main"
+    assert frames[1].offset == 128
+    assert frames[1].file is None
+    assert lldb_mcp_server._parse_backtrace(output) is frames
+
+
+def test_build_debug_script():
+    """Test that a program run is assembled into a single quoted LLDB script."""
+    import lldb_mcp_server
+
+    params = lldb_mcp_server.RunProgramInput(
+        executable="/tmp/prog",
+        args=["in put.txt"],
+        breakpoints=["parse", "/src/main.cpp:42"],
+        environment={"MODE": "debug build"},
+    )
+    commands = lldb_mcp_server._build_debug_script(params)
+
+    assert commands == [
+        "settings set target.env-vars 'MODE=debug build'",
+        "breakpoint set --name parse",
+        "breakpoint set --file /src/main.cpp --line 42",
+        "run 'in put.txt'",
+        "thread backtrace",
+        "frame variable",
+        "quit",
+    ]
+
+    # `settings set` replaces the dictionary, so every variable goes in one setting
+    params = params.model_copy(update={"environment": {"MODE": "debug build", "LEVEL": "3"}})
+    assert lldb_mcp_server._build_debug_script(params)[0] == (
+        "settings set target.env-vars 'MODE=debug build' LEVEL=3"
+    )
+
+
+def test_breakpoint_command_classifies_locations():
+    """Test that addresses, file:line and qualified names map to the right options."""
+    import lldb_mcp_server
+
+    assert lldb_mcp_server._breakpoint_command("0x400500") == "breakpoint set --address 0x400500"
+    assert (
+        lldb_mcp_server._breakpoint_command("C:/src/main.cpp:42")
+        == "breakpoint set --file C:/src/main.cpp --line 42"
+    )
+    assert (
+        lldb_mcp_server._breakpoint_command("MyClass::method")
+        == "breakpoint set --name MyClass::method"
+    )
+
+
+def test_inspect_script_quotes_breakpoint_and_args():
+    """Test that breakpoints and program arguments are quoted into the run script."""
+    import lldb_mcp_server
+
+    commands = lldb_mcp_server._build_inspect_script(
+        "operator delete", ["in put.txt", "x;y"], ["frame variable"]
+    )
+
+    assert commands == [
+        "breakpoint set --name 'operator delete'",
+        "run 'in put.txt' 'x;y'",
+        "frame variable",
+        "quit",
+    ]
+    assert lldb_mcp_server._core_target_command("/tmp/my prog", "/tmp/core") == (
+        "target create '/tmp/my prog' --core /tmp/core"
+    )
+
+
+def test_sb_launch_command_redirects_inferior_stdio():
+    """Test that launches on the SB API backend keep the inferior off the MCP pipes."""
+    import os
+
+    import lldb_mcp_server
+
+    launch = lldb_mcp_server._sb_launch_command("run 'in put.txt'", "/t/out", "/t/err", "/work")
+    assert launch == (
+        f"process launch -i {os.devnull} -o /t/out -e /t/err -w /work -- 'in put.txt'"
+    )
+    assert lldb_mcp_server._sb_launch_command("bt", "/t/out", "/t/err", None) == "bt"
+    custom = "process launch -o log.txt"
+    assert lldb_mcp_server._sb_launch_command(custom, "/t/out", "/t/err", None) == custom
+
+
+def test_session_pool_reuses_released_sessions():
+    """Test that released sessions are reset and handed out again."""
+    import lldb_mcp_server
+
+    first = lldb_mcp_server._acquire_session("/tmp/prog")
+    first.breakpoints[1] = {"location": "main"}
+    lldb_mcp_server.release_session(first.session_id)
+
+    second = lldb_mcp_server._acquire_session()
+    assert second is first
+    assert second.session_id in lldb_mcp_server._sessions
+    assert second.target_path is None
+    assert second.breakpoints == {}
+    lldb_mcp_server.release_session(second.session_id)
+
+
+def test_session_id_reuses_one_lldb_process(monkeypatch):
+    """Test that a session keeps its breakpoints across calls on one LLDB process."""
+    import asyncio
+    import collections
+    import threading
+
+    import lldb_mcp_server
+
+    started = []
+
+    class FakeLldb(lldb_mcp_server.LldbWorker):
+        """Runs the real reset logic against a stand-in for LLDB's breakpoint table."""
+
+        alive = True
+
+        def __init__(self, target=None, working_dir=None):
+            self.target, self.working_dir = target, working_dir
+            self.lock = threading.Lock()
+            self.breakpoints = []
+            started.append(self)
+
+        def _execute(self, commands, timeout):
+            output = []
+            for command in commands:
+                if command.startswith("target delete"):
+                    self.breakpoints.clear()
+                elif command.startswith("breakpoint set"):
+                    self.breakpoints.append(command)
+                    output.append(f"Breakpoint {len(self.breakpoints)}: {command}\n")
+                elif command == "breakpoint list":
+                    output += (f"{i}: {bp}\n" for i, bp in enumerate(self.breakpoints, 1))
+            return {"success": True, "output": "".join(output), "error": None, "return_code": 0}
+
+        def close(self):
+            pass
+
+    monkeypatch.setattr(lldb_mcp_server, "LldbWorker", FakeLldb)
+    monkeypatch.setattr(lldb_mcp_server, "_sessions", collections.OrderedDict())
+    monkeypatch.setattr(lldb_mcp_server, "_session_pool", collections.deque())
+
+    def breakpoint(location):
+        return lldb_mcp_server.SetBreakpointInput(
+            executable="/tmp/prog", location=location, session_id="s1"
+        )
+
+    async def calls():
+        await lldb_mcp_server.lldb_set_breakpoint(breakpoint("parse"))
+        run = lldb_mcp_server.RunProgramInput(
+            executable="/tmp/prog", breakpoints=["parse", "main"], session_id="s1"
+        )
+        await lldb_mcp_server.lldb_run(run)
+        await lldb_mcp_server.lldb_run(run)
+        return await lldb_mcp_server.lldb_set_breakpoint(breakpoint("main"))
+
+    result = asyncio.run(calls())
+
+    assert started[0].breakpoints == ["breakpoint set --name parse", "breakpoint set --name main"]
+    assert "1: breakpoint set --name parse" in result
+    assert len(started) == 1
+    session = lldb_mcp_server._sessions["s1"]
+    assert session.process is started[0]
+    assert session.breakpoints[1] == {
+        "location": "breakpoint set --name parse",
+        "command": "breakpoint set --name parse",
+    }
+
+    closed = asyncio.run(
+        lldb_mcp_server.lldb_release_session(lldb_mcp_server.ReleaseSessionInput(session_id="s1"))
+    )
+    assert closed == "Closed debug session 's1'."
+    assert "s1" not in lldb_mcp_server._sessions
+
+
+def test_failed_worker_start_is_not_pooled(monkeypatch):
+    """Test that an LLDB worker that dies during setup is reported, not pooled."""
+    import collections
+
+    import lldb_mcp_server
+
+    monkeypatch.setattr(lldb_mcp_server, "LLDB_EXECUTABLE", shutil.which("false"))
+    monkeypatch.setattr(lldb_mcp_server, "_workers", collections.OrderedDict())
+
+    result = lldb_mcp_server._run_in_worker(["version"], None, None, timeout=5)
+
+    assert result["success"] is False
+    assert not lldb_mcp_server._workers
+
+
+def test_worker_pool_starts_and_evicts_outside_pool_lock(monkeypatch):
+    """Test that workers start without the pool lock and evicted ones finish their call."""
+    import collections
+    import threading
+
+    import lldb_mcp_server
+
+    events = []
+
+    class FakeWorker:
+        def __init__(self, target, working_dir):
+            assert not lldb_mcp_server._workers_lock.locked()
+            self.target = target
+            self.lock = threading.Lock()
+            self.alive = True
+
+        def close(self):
+            events.append(f"close {self.target}")
+            self.alive = False
+
+    monkeypatch.setattr(lldb_mcp_server, "LldbWorker", FakeWorker)
+    monkeypatch.setattr(lldb_mcp_server, "_workers", collections.OrderedDict())
+    monkeypatch.setattr(lldb_mcp_server, "MAX_WORKERS", 1)
+
+    busy = lldb_mcp_server._acquire_worker("/tmp/a", None)
+    assert lldb_mcp_server._acquire_worker("/tmp/a", None) is busy
+
+    busy.lock.acquire()
+    timer = threading.Timer(0.2, lambda: (events.append("call done"), busy.lock.release()))
+    timer.start()
+    lldb_mcp_server._acquire_worker("/tmp/b", None)
+    timer.join()
+
+    assert events == ["call done", "close /tmp/a"]
+    assert list(lldb_mcp_server._workers) == [("/tmp/b", None)]
+
+
+def test_worker_target_path_is_quoted():
+    """Test that a worker reloads a target whose path has quotes or backslashes."""
+    import lldb_mcp_server
+
+    worker = object.__new__(lldb_mcp_server.LldbWorker)
+    worker.target = '/tmp/my "odd" \\dir/prog'
+
+    assert worker._reset_commands()[-1] == "target create '/tmp/my \"odd\" \\dir/prog'"
+
+
+def test_symbol_lookup_rejects_invalid_regex(monkeypatch):
+    """Test that a malformed regex is reported without running LLDB."""
+    import asyncio
+
+    import lldb_mcp_server
+
+    async def fake_script(commands, **kwargs):
+        raise AssertionError("LLDB should not run for an invalid regex")
+
+    monkeypatch.setattr(lldb_mcp_server, "_run_lldb_script", fake_script)
+    params = lldb_mcp_server.SymbolLookupInput(
+        executable="/tmp/prog", query="parse(", query_type="regex"
+    )
+    result = asyncio.run(lldb_mcp_server.lldb_symbols(params))
+
+    assert "Invalid regex" in result
+
+
+def test_symbol_regex_left_to_lldb_when_engines_differ(tmp_path, monkeypatch):
+    """Test that a pattern only Python rejects still reaches LLDB, quoted."""
+    import asyncio
+
+    import lldb_mcp_server
+
+    exe = tmp_path / "prog"
+    exe.write_bytes(b"")
+    scripts = []
+
+    async def fake_script(commands, **kwargs):
+        scripts.append(commands)
+        return {"success": True, "output": "ok", "error": None}
+
+    monkeypatch.setattr(lldb_mcp_server, "_run_lldb_script", fake_script)
+    asyncio.run(lldb_mcp_server.lldb_invalidate_cache())
+    params = lldb_mcp_server.SymbolLookupInput(
+        executable=str(exe), query=r"\iter.*", query_type="regex"
+    )
+    asyncio.run(lldb_mcp_server.lldb_symbols(params))
+
+    assert scripts == [["image lookup --regex --name '\\iter.*'"]]
+
+
+def test_sessions_evict_least_recently_used(monkeypatch):
+    """Test that the session table is bounded and evicts the stalest session."""
+    import collections
+
+    import lldb_mcp_server
+
+    monkeypatch.setattr(lldb_mcp_server, "_MAX_SESSIONS", 2)
+    monkeypatch.setattr(lldb_mcp_server, "_sessions", collections.OrderedDict())
+
+    first = lldb_mcp_server._acquire_session().session_id
+    second = lldb_mcp_server._acquire_session().session_id
+    lldb_mcp_server._touch(first)
+    third = lldb_mcp_server._acquire_session().session_id
+
+    assert list(lldb_mcp_server._sessions) == [first, third]
+    assert second not in lldb_mcp_server._sessions
+
+
+def test_static_commands_cached_on_disk(monkeypatch, tmp_path):
+    """Test that help/version output is reused and persisted per LLDB binary."""
+    import asyncio
+
+    import lldb_mcp_server
+
+    calls = []
+
+    async def fake_command(command, *args):
+        calls.append(command)
+        return {"success": True, "output": f"{command} output", "error": None, "return_code": 0}
+
+    cache_file = tmp_path / "static.json"
+    monkeypatch.setattr(lldb_mcp_server, "_run_lldb_command_uncached", fake_command)
+    monkeypatch.setattr(lldb_mcp_server, "_static_cache_path", lambda: cache_file)
+    monkeypatch.setattr(lldb_mcp_server, "_STATIC_CACHE", {})
+    monkeypatch.setattr(lldb_mcp_server, "_static_cache_source", None)
+
+    asyncio.run(lldb_mcp_server._run_lldb_command("version"))
+    result = asyncio.run(lldb_mcp_server._run_lldb_command("version"))
+    asyncio.run(lldb_mcp_server._run_lldb_command("breakpoint list"))
+
+    assert result["output"] == "version output"
+    assert calls == ["version", "breakpoint list"]
+    assert "version output" in cache_file.read_text()
+
+    monkeypatch.setattr(lldb_mcp_server, "_STATIC_CACHE", {})
+    monkeypatch.setattr(lldb_mcp_server, "_static_cache_source", None)
+    asyncio.run(lldb_mcp_server._run_lldb_command("version"))
+    assert calls == ["version", "breakpoint list"]
+
+
+def test_static_cache_follows_lldbinit_changes(monkeypatch, tmp_path):
+    """Test that editing ~/.lldbinit stops cached help/version output from being served."""
+    import asyncio
+    import os
+
+    import lldb_mcp_server
+
+    calls = []
+
+    async def fake_command(command, *args):
+        calls.append(command)
+        return {"success": True, "output": f"{command} output", "error": None, "return_code": 0}
+
+    lldbinit = tmp_path / ".lldbinit"
+    lldbinit.write_text("command alias bt2 thread backtrace 2\n")
+    monkeypatch.setattr(lldb_mcp_server, "_run_lldb_command_uncached", fake_command)
+    monkeypatch.setattr(lldb_mcp_server, "_lldb_binary_digest", lambda: "0123")
+    monkeypatch.setattr(lldb_mcp_server, "_LLDB_PATH_CACHE", tmp_path / "lldb_path")
+    monkeypatch.setattr(lldb_mcp_server, "_LLDBINIT_FILES", (str(lldbinit),))
+    monkeypatch.setattr(lldb_mcp_server, "_STATIC_CACHE", {})
+    monkeypatch.setattr(lldb_mcp_server, "_static_cache_source", None)
+
+    asyncio.run(lldb_mcp_server._run_lldb_command("help"))
+    asyncio.run(lldb_mcp_server._run_lldb_command("help"))
+    assert calls == ["help"]
+
+    os.utime(lldbinit, ns=(0, 0))
+    asyncio.run(lldb_mcp_server._run_lldb_command("help"))
+    assert calls == ["help", "help"]
+
+
+def test_prewarm_splits_one_run_into_static_entries(monkeypatch, tmp_path):
+    """Test that common help topics are fetched together and cached per command."""
+    import asyncio
+
+    import lldb_mcp_server
+
+    scripts = []
+
+    async def fake_script(commands, **kwargs):
+        scripts.append(commands)
+        output = "".join(f"(lldb) {command}\n{command} text\n" for command in commands)
+        return {"success": True, "output": output, "error": None, "return_code": 0}
+
+    monkeypatch.setattr(lldb_mcp_server, "_run_lldb_script", fake_script)
+    monkeypatch.setattr(lldb_mcp_server, "_static_cache_path", lambda: tmp_path / "static.json")
+    monkeypatch.setattr(lldb_mcp_server, "_STATIC_CACHE", {})
+    monkeypatch.setattr(lldb_mcp_server, "_static_cache_source", None)
+
+    asyncio.run(lldb_mcp_server._prewarm_static_cache())
+    asyncio.run(lldb_mcp_server._prewarm_static_cache())
+
+    assert len(scripts) == 1
+    help_result = lldb_mcp_server._static_lookup(("help", True))
+    memory_result = lldb_mcp_server._static_lookup(("help memory", True))
+    assert help_result is not None and help_result["output"] == "(lldb) help\nhelp text"
+    assert memory_result is not None and memory_result["output"].endswith("help memory text")
+
+
+def test_prewarm_skipped_on_persistent_backend(monkeypatch):
+    """Test that the startup prewarm only runs on backends whose output it can split."""
+    import asyncio
+
+    import lldb_mcp_server
+
+    started = []
+
+    async def fake_prewarm():
+        started.append(lldb_mcp_server.LLDB_BACKEND)
+
+    async def serve():
+        async with lldb_mcp_server._lifespan(lldb_mcp_server.mcp):
+            await asyncio.sleep(0)
+
+    monkeypatch.setattr(lldb_mcp_server, "_prewarm_static_cache", fake_prewarm)
+    for backend in ("persistent", "batch"):
+        monkeypatch.setattr(lldb_mcp_server, "LLDB_BACKEND", backend)
+        asyncio.run(serve())
+
+    assert started == ["batch"]
+
+
+def test_concurrent_readonly_lookups_share_one_run(tmp_path, monkeypatch):
+    """Test that identical in-flight read-only queries coalesce into one LLDB run."""
+    import asyncio
+
+    import lldb_mcp_server
+
+    exe = tmp_path / "prog"
+    exe.write_bytes(b"")
+    calls = []
+
+    async def fake_run(commands, *args, **kwargs):
+        calls.append(commands)
+        await asyncio.sleep(0.01)
+        return {"success": True, "output": "main:\n  ret", "error": None}
+
+    monkeypatch.setattr(lldb_mcp_server, "_run_lldb_script", fake_run)
+    asyncio.run(lldb_mcp_server.lldb_invalidate_cache())
+
+    params = lldb_mcp_server.DisassembleInput(executable=str(exe), target="main")
+
+    async def main():
+        return await asyncio.gather(*(lldb_mcp_server.lldb_disassemble(params) for _ in range(3)))
+
+    results = asyncio.run(main())
+
+    assert len(calls) == 1
+    assert len(set(results)) == 1
+
+
+def test_inspect_batches_views_into_one_run(monkeypatch):
+    """Test that lldb_inspect gathers every requested view after a single launch."""
+    import asyncio
+
+    import pydantic
+    import pytest
+
+    import lldb_mcp_server
+
+    scripts = []
+
+    async def fake_run(commands, *args, **kwargs):
+        scripts.append(commands)
+        return {"success": True, "output": "ok", "error": None}
+
+    monkeypatch.setattr(lldb_mcp_server, "_run_lldb_script", fake_run)
+    params = lldb_mcp_server.InspectInput(
+        executable="/tmp/prog",
+        breakpoint="parse",
+        include=["bt", "vars", "regs", "memory"],
+        memory_address="&buf",
+        memory_count=16,
+    )
+    asyncio.run(lldb_mcp_server.lldb_inspect(params))
+
+    assert scripts == [
+        [
+            "breakpoint set --name parse",
+            "run",
+            "thread backtrace",
+            "frame variable",
+            "register read",
+            "memory read --format x --count 16 &buf",
+            "quit",
+        ]
+    ]
+    with pytest.raises(pydantic.ValidationError):
+        lldb_mcp_server.InspectInput(executable="/tmp/prog", breakpoint="parse", include=["memory"])
+
+
+def test_core_file_queries_skip_the_launch(monkeypatch):
+    """Test that core_file replaces the breakpoint/run prefix with a core load."""
+    import asyncio
+
+    import pydantic
+    import pytest
+
+    import lldb_mcp_server
+
+    scripts = []
+
+    async def fake_run(commands, *args, **kwargs):
+        scripts.append(commands)
+        return {"success": True, "output": "ok", "error": None}
+
+    monkeypatch.setattr(lldb_mcp_server, "_run_lldb_script", fake_run)
+    params = lldb_mcp_server.EvaluateExpressionInput(
+        executable="/tmp/prog", expression="ptr->len", core_file="/tmp/core"
+    )
+    asyncio.run(lldb_mcp_server.lldb_evaluate(params))
+
+    assert scripts == [["target create /tmp/prog --core /tmp/core", "expression ptr->len"]]
+    with pytest.raises(pydantic.ValidationError):
+        lldb_mcp_server.RegistersInput(executable="/tmp/prog")
+
+
+def test_all_registers_drop_oversized_vector_section():
+    """Test that an 'all' dump keeps every set it can and measures only the registers."""
+    import lldb_mcp_server
+
+    begin, read, end = lldb_mcp_server._register_commands("all")
+    assert read == "register read --all"
+    dump = (
+        "General Purpose Registers:\n       rax = 0x1\n\n"
+        "Floating Point Registers:\n     fcw = 0x037f\n\n"
+        "Advanced Vector Extensions:\n" + "      zmm0 = {...}\n" * 10000 + "\n"
+        "Memory Protection Keys:\n      pkru = 0x55555554\n"
+    )
+    # The batch backend echoes each command; persistent workers do not
+    batch = (
+        f"(lldb) {begin}\n<<<REGISTERS>>>\n(lldb) {read}\n{dump}"
+        f"(lldb) {end}\n<<<END REGISTERS>>>\n(lldb) quit"
+    )
+    persistent = f"<<<REGISTERS>>>\n{dump}<<<END REGISTERS>>>"
+
+    for output in (batch, persistent):
+        capped = lldb_mcp_server._cap_register_output(output)
+        assert "rax = 0x1" in capped
+        assert "fcw = 0x037f" in capped
+        assert "pkru = 0x55555554" in capped
+        assert "zmm0" not in capped
+        assert "omitted" in capped and "Advanced Vector Extensions" in capped
+        assert "<<<" not in capped
+    assert capped.startswith("General Purpose Registers:")
+    assert lldb_mcp_server._cap_register_output(batch).endswith("(lldb) quit")
+
+    # Output outside the markers, such as a large variable dump, does not count
+    small = (
+        f"(lldb) frame variable\n{'x' * 100000}\n<<<REGISTERS>>>\n{dump[:60]}<<<END REGISTERS>>>"
+    )
+    assert "rax = 0x1" in lldb_mcp_server._cap_register_output(small)
+    assert "omitted" not in lldb_mcp_server._cap_register_output(small)
@@ -93,7 +93,13 @@ def check_clang() -> bool:
     if not check("clang++ found in PATH", clang is not None, clang or "not found"):
         return False
     try:
-        r = subprocess.run(["clang++", "--version"], capture_output=True, text=True, timeout=10)
+        r = subprocess.run(
+            ["clang++", "--version"],
+            stdout=subprocess.PIPE,
+            stderr=subprocess.DEVNULL,
+            text=True,
+            timeout=10,
+        )
         ok = r.returncode == 0
         check("clang++ --version succeeds", ok, r.stdout.strip()[:100])
         return ok
@@ -110,7 +116,14 @@ def check_compile() -> bool:
     exe = FIXTURES_DIR / ("simple.exe" if sys.platform == "win32" else "simple")
     cmd = ["clang++", "-g", "-O0", "-o", str(exe), str(SIMPLE_SRC)]
     try:
-        r = subprocess.run(cmd, capture_output=True, text=True, timeout=30, cwd=str(FIXTURES_DIR))
+        r = subprocess.run(
+            cmd,
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.PIPE,
+            text=True,
+            timeout=30,
+            cwd=str(FIXTURES_DIR),
+        )
         ok = r.returncode == 0 and exe.exists()
         check("Compilation succeeds", ok, r.stderr.strip()[:200] if not ok else str(exe))
         return ok
@@ -127,7 +140,7 @@ def check_lldb_loads() -> bool:
     if not check("Binary exists", exe.exists(), str(exe)):
         return False
 
-    r = _run_lldb_script([f"target create {exe}", "target list"])
+    r = asyncio.run(_run_lldb_script([f"target create {exe}", "target list"]))
     ok = "current target" in r["output"].lower() or r["success"]
     check("LLDB target create succeeds", ok, r["output"][:200])
     return ok
@@ -143,14 +156,16 @@ def check_breakpoint_hits() -> bool:
         return False
 
     # Function name breakpoint
-    r = _run_lldb_script(
-        [
-            f"target create {exe}",
-            "breakpoint set --name add",
-            "run",
-            "thread backtrace",
-            "quit",
-        ]
+    r = asyncio.run(
+        _run_lldb_script(
+            [
+                f"target create {exe}",
+                "breakpoint set --name add",
+                "run",
+                "thread backtrace",
+                "quit",
+            ]
+        )
     )
     out = r["output"]
     bp_set = "Breakpoint 1" in out or "breakpoint" in out.lower()
@@ -159,14 +174,16 @@ def check_breakpoint_hits() -> bool:
     check("Execution stops at breakpoint", stopped, out[:300])
 
     # File:line breakpoint
-    r2 = _run_lldb_script(
-        [
-            f"target create {exe}",
-            f"breakpoint set --file {SIMPLE_SRC} --line 5",
-            "breakpoint list",
-            "run",
-            "quit",
-        ]
+    r2 = asyncio.run(
+        _run_lldb_script(
+            [
+                f"target create {exe}",
+                f"breakpoint set --file {SIMPLE_SRC} --line 5",
+                "breakpoint list",
+                "run",
+                "quit",
+            ]
+        )
     )
     check(
         "File:line breakpoint (simple.cpp:5) resolves",
@@ -186,14 +203,16 @@ def check_variables() -> bool:
         check("Binary available", False, str(exe))
         return False
 
-    r = _run_lldb_script(
-        [
-            f"target create {exe}",
-            "breakpoint set --name add",
-            "run",
-            "frame variable",
-            "quit",
-        ]
+    r = asyncio.run(
+        _run_lldb_script(
+            [
+                f"target create {exe}",
+                "breakpoint set --name add",
+                "run",
+                "frame variable",
+                "quit",
+            ]
+        )
     )
     out = r["output"]
     has_a = "a" in out and ("int" in out or "=" in out)
@@ -212,14 +231,16 @@ def check_backtrace() -> bool:
         check("Binary available", False, str(exe))
         return False
 
-    r = _run_lldb_script(
-        [
-            f"target create {exe}",
-            "breakpoint set --name add",
-            "run",
-            "thread backtrace",
-            "quit",
-        ]
+    r = asyncio.run(
+        _run_lldb_script(
+            [
+                f"target create {exe}",
+                "breakpoint set --name add",
+                "run",
+                "thread backtrace",
+                "quit",
+            ]
+        )
     )
     out = r["output"]
     check("Frame #0 in backtrace", "#0" in out, out[:300])